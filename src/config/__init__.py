@@ -1,6 +1,7 @@
 """Configuration management for the sentiment analysis system"""
+import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -8,7 +9,7 @@ from dotenv import load_dotenv
 class APIConfig:
     """API configuration settings"""
     fng_api_url: str
-    bitcoin_price_api_url: str = "https://api.alternative.me/v2/ticker/?limit=1"
+    bitcoin_price_api_url: str = "https://api.alternative.me/v2/ticker/?limit=20"  # Top assets, Bitcoin first
     reddit_client_id: Optional[str] = None
     reddit_client_secret: Optional[str] = None
     reddit_user_agent: Optional[str] = None
@@ -17,6 +18,9 @@ class APIConfig:
     rss_base_url: str = "https://rss.app/feeds/v1.1"
     rss_feeds: dict = None  # Will be populated in _load_config
 
+# Source weights of SentimentConfig, the only settings calibration persists
+WEIGHT_FIELDS = ('fear_greed_weight', 'reddit_weight', 'rss_weight', 'rss_2_weight')
+
 @dataclass
 class SentimentConfig:
     """Sentiment analysis configuration"""
@@ -27,6 +31,39 @@ class SentimentConfig:
     reddit_post_limit: int = 100
     reddit_default_subreddit: str = "CryptoCurrency"
     reddit_default_sort: str = "new"    
+    adaptive_sampling: bool = False  # Stop scoring once the mean has converged
+    # At a typical score spread (sd ~0.35) the first page of 50 already meets
+    # the tolerance, so quiet periods cost half of reddit_post_limit's quota
+    sampling_page_size: int = 50
+    sampling_tolerance: float = 0.1  # Target confidence interval half-width
+    sampling_confidence_z: float = 1.96
+    sampling_min_items: int = 20
+    domain_phrases: bool = True  # Score multi-word crypto phrases
+
+@dataclass
+class StorageConfig:
+    """Local storage settings"""
+    archive_dir: str = "data/archive"
+    weights_file: str = "data/sentiment_weights.json"
+    source_cache_file: str = "data/source_cache.json"
+    history_file: str = "data/history.jsonl"
+
+@dataclass
+class SourceCacheConfig:
+    """Last-known-good fallback and hedging settings for sentiment sources"""
+    latency_budget: float = 15.0  # Seconds to wait before serving a cached result
+    hedge_after: float = 3.0  # Seconds before a duplicate HTTP request is sent
+    request_timeout: float = 30.0
+    default_max_age: float = 6 * 3600  # Oldest cached result that may be served, in seconds
+    max_age: dict = None  # Per-source overrides, populated in _load_config
+
+@dataclass
+class QueryServerConfig:
+    """Local query server settings"""
+    host: str = "127.0.0.1"
+    port: int = 8765
+    buffer_size: int = 4096  # Most recent runs kept in memory
+    poll_interval: float = 5.0  # Seconds between checks for new history
 
 class Config:
     """Global configuration singleton"""
@@ -56,7 +93,48 @@ class Config:
             "CryptoSlate": f"{self.api_config.rss_base_url}/{os.getenv('CRYPTO_SLATE_RSS_ID')}.json"
         }
         
-        self.sentiment = SentimentConfig()
+        self.storage = StorageConfig(
+            archive_dir=os.getenv('SENTIMENT_ARCHIVE_DIR', StorageConfig.archive_dir),
+            weights_file=os.getenv('SENTIMENT_WEIGHTS_FILE', StorageConfig.weights_file),
+            source_cache_file=os.getenv('SOURCE_CACHE_FILE', StorageConfig.source_cache_file),
+            history_file=os.getenv('SENTIMENT_HISTORY_FILE', StorageConfig.history_file)
+        )
+        self.sentiment = self._load_sentiment_config()
+        
+        # The index only updates daily, social and news sources go stale sooner
+        self.source_cache = SourceCacheConfig()
+        self.source_cache.max_age = {
+            "fear_greed": 48 * 3600,
+            "reddit": 6 * 3600,
+            "CoinTelegraph": 12 * 3600,
+            "CryptoSlate": 12 * 3600
+        }
+        
+        self.query_server = QueryServerConfig(
+            host=os.getenv('QUERY_SERVER_HOST', QueryServerConfig.host),
+            port=int(os.getenv('QUERY_SERVER_PORT', QueryServerConfig.port))
+        )
+
+    def _load_sentiment_config(self) -> SentimentConfig:
+        """Load sentiment settings, applying calibrated weights when present
+        
+        Only the weight fields are read from the file, every other setting
+        keeps its default. An unreadable file leaves the default weights.
+        """
+        sentiment = SentimentConfig()
+        if not os.path.exists(self.storage.weights_file):
+            return sentiment
+        
+        try:
+            with open(self.storage.weights_file) as f:
+                saved = json.load(f)
+            if not isinstance(saved, dict):
+                raise ValueError("expected a JSON object")
+            weights = {field: float(saved[field]) for field in WEIGHT_FIELDS if field in saved}
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Warning: Ignoring unreadable weights file {self.storage.weights_file}: {e}")
+            return sentiment
+        return replace(sentiment, **weights)
 
 # Global config instance
 config = Config()
@@ -0,0 +1,17 @@
+import argparse
+
+from src.sentiment.lexicon import ARTIFACT_PATH, artifact_is_current, build_lexicon_artifact, read_artifact_header
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the VADER lexicon and crypto overrides into a binary artifact")
+    parser.add_argument("--output", default=str(ARTIFACT_PATH), help="Where to write the artifact")
+    parser.add_argument("--if-stale", action="store_true", help="Skip when the artifact already matches the overrides")
+    args = parser.parse_args()
+
+    if args.if_stale and artifact_is_current(args.output):
+        print(f"{args.output} is up to date")
+    else:
+        path = build_lexicon_artifact(args.output)
+        version, count, vader_digest, overrides_digest = read_artifact_header(path)
+        print(f"Wrote {count} entries to {path} (format v{version}, "
+              f"vader sha256 {vader_digest[:12]}, overrides sha256 {overrides_digest[:12]})")
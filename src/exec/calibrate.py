@@ -0,0 +1,60 @@
+import argparse
+import time
+import numpy as np
+
+from src.config import config
+from src.exec.replay import parse_time
+from src.services.calibration import (
+    METRICS, TARGET_HORIZONS, WEIGHT_FIELDS, evaluate_weights, forward_returns, grid_weights,
+    load_calibration_data, random_weights, save_sentiment_config, weights_to_config
+)
+from src.utils.errors.exceptions import SentimentAnalysisError
+
+def calibrate_weights(archive_dir: str = None,
+                      target: str = 'change_24h',
+                      metric: str = 'correlation',
+                      samples: int = None,
+                      grid_step: float = 0.05,
+                      output: str = None,
+                      start=None,
+                      end=None):
+    """Search source weights against archived history and save the best"""
+    data = load_calibration_data(archive_dir, start=start, end=end)
+    returns = forward_returns(data.timestamps, data.prices, TARGET_HORIZONS[target])
+    candidates = random_weights(samples) if samples else grid_weights(grid_step)
+
+    started = time.perf_counter()
+    result = evaluate_weights(data.scores, returns, candidates)
+    elapsed = time.perf_counter() - started
+
+    best = result.best(metric)
+    current_weights = np.array([[getattr(config.sentiment, field) for field in WEIGHT_FIELDS]])
+    baseline = evaluate_weights(data.scores, returns, current_weights)
+
+    print(f"Evaluated {len(candidates)} weight vectors on {result.sample_count} runs in {elapsed:.2f}s")
+    print(f"Current weights: correlation {baseline.correlation[0]:.3f}, hit rate {baseline.hit_rate[0]:.1%}")
+    print(f"Best by {metric}: correlation {result.correlation[best]:.3f}, hit rate {result.hit_rate[best]:.1%}")
+    for field, weight in zip(WEIGHT_FIELDS, result.weights[best]):
+        print(f"  {field}: {weight:.3f}")
+
+    path = save_sentiment_config(weights_to_config(result.weights[best]), output)
+    print(f"Saved calibrated weights to {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate source weights against forward price returns")
+    parser.add_argument("--archive-dir", help="Directory holding snapshot archives")
+    parser.add_argument("--target", choices=sorted(TARGET_HORIZONS), default='change_24h',
+                        help="Forward price change to predict")
+    parser.add_argument("--metric", choices=METRICS, default='correlation', help="Metric to maximize")
+    parser.add_argument("--samples", type=int, help="Evaluate this many random weight vectors instead of a grid")
+    parser.add_argument("--grid-step", type=float, default=0.05, help="Grid spacing when not sampling")
+    parser.add_argument("--output", help="Where to write the calibrated SentimentConfig")
+    parser.add_argument("--start", type=parse_time, help="Only use runs at or after this time")
+    parser.add_argument("--end", type=parse_time, help="Only use runs before this time")
+    args = parser.parse_args()
+
+    try:
+        calibrate_weights(args.archive_dir, args.target, args.metric, args.samples,
+                          args.grid_step, args.output, args.start, args.end)
+    except SentimentAnalysisError as e:
+        print(f"Calibration error: {str(e)}")
@@ -0,0 +1,43 @@
+import argparse
+import time
+from datetime import datetime
+from pytz import timezone
+
+from src.services.replay import ReplayEngine
+from src.services.snapshot_archive import SnapshotArchive
+
+def parse_time(value: str) -> datetime:
+    """Parse an ISO timestamp, assuming Singapore time when no offset is given"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = timezone('Asia/Singapore').localize(parsed)
+    return parsed
+
+def replay_archive(archive_dir: str = None, start: datetime = None, end: datetime = None):
+    """Replay archived snapshots offline and print a summary"""
+    engine = ReplayEngine()
+    archive = SnapshotArchive(archive_dir)
+
+    started = time.perf_counter()
+    results = list(engine.replay(archive.iter_snapshots(start=start, end=end)))
+    elapsed = time.perf_counter() - started
+
+    if not results:
+        print("No snapshots replayed")
+        return
+
+    final_scores = [result.combined.final_score for result in results]
+    print(f"Replayed {len(results)} snapshots ({engine.skipped} skipped) in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.0f} snapshots/s)")
+    print(f"Score cache: {engine.scorer.hits} hits, {engine.scorer.misses} misses")
+    print(f"Final Weighted Score: mean {sum(final_scores) / len(final_scores):.2f}, "
+          f"min {min(final_scores):.2f}, max {max(final_scores):.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay archived sentiment runs offline")
+    parser.add_argument("--archive-dir", help="Directory holding snapshot archives")
+    parser.add_argument("--start", type=parse_time, help="Only replay snapshots at or after this time")
+    parser.add_argument("--end", type=parse_time, help="Only replay snapshots before this time")
+    args = parser.parse_args()
+
+    replay_archive(args.archive_dir, args.start, args.end)
@@ -2,12 +2,15 @@ from datetime import datetime
 from pytz import timezone
 
 from src.config import config
-from src.models import CombinedSentiment, FearGreedScore, RedditScore
 from src.sentiment.fear_greed_index import CNNFearGreedFetcher, FearGreedAnalyzer
 from src.sentiment.reddit_analyzer import RedditSentimentAnalyzer
 from src.sentiment.rss_feed import RSSFeedSentimentAnalyzer
+from src.sentiment.combiner import build_fear_greed_score, build_reddit_score, combine_asset_sentiment, combine_sentiment
 from src.utils.sheets.sheets_writer import append_to_sheet
 from src.services.price_service import price_service
+from src.services.snapshot_archive import SnapshotArchive, build_snapshot
+from src.services.source_cache import SourceCache, is_stale
+from src.services.history import SentimentHistory, build_history_record
 from src.utils.errors.exceptions import SentimentAnalysisError
 
 def collect_and_append_sentiment():
@@ -20,33 +23,29 @@ def collect_and_append_sentiment():
         cointelegraph_analyzer = RSSFeedSentimentAnalyzer(config.api_config.rss_feeds["CoinTelegraph"])
         cryptoslate_analyzer = RSSFeedSentimentAnalyzer(config.api_config.rss_feeds["CryptoSlate"])
         
+        # Sources that fail or run slow fall back to their last good result
+        source_cache = SourceCache()
+        
         # Get Fear & Greed sentiment
-        fear_greed_result = fear_greed_analyzer.get_sentiment()
-        fear_greed_score = FearGreedScore(
-            value=fear_greed_result.value,
-            raw_value=fear_greed_result.raw_data['original_value'],
-            timestamp=datetime.fromisoformat(fear_greed_result.timestamp),
-            classification=fear_greed_result.classification,
-            interpretation=fear_greed_result.interpretation
-        )
+        fear_greed_result = source_cache.get_sentiment("fear_greed", fear_greed_analyzer.get_sentiment)
+        fear_greed_score = build_fear_greed_score(fear_greed_result)
         
         # Get Reddit sentiment
-        reddit_result = reddit_analyzer.get_sentiment()
-        sentiment_dist = reddit_result.raw_data['sentiment_distribution']
-        total_posts = reddit_result.raw_data['total_posts']
-        reddit_score = RedditScore(
-            value=reddit_result.value,
-            raw_value=reddit_result.raw_data['average_sentiment'],
-            timestamp=datetime.fromisoformat(reddit_result.timestamp),
-            positive_ratio=sentiment_dist.get('Positive', 0) / total_posts if total_posts > 0 else 0,
-            negative_ratio=sentiment_dist.get('Negative', 0) / total_posts if total_posts > 0 else 0,
-            neutral_ratio=sentiment_dist.get('Neutral', 0) / total_posts if total_posts > 0 else 0,
-            post_count=total_posts
-        )
+        reddit_result = source_cache.get_sentiment("reddit", reddit_analyzer.get_sentiment)
+        reddit_score = build_reddit_score(reddit_result)
         
         # Get RSS Feed sentiment
-        rss_1_score = cointelegraph_analyzer.get_sentiment()
-        rss_2_score = cryptoslate_analyzer.get_sentiment()
+        rss_1_score = source_cache.get_sentiment("CoinTelegraph", cointelegraph_analyzer.get_sentiment)
+        rss_2_score = source_cache.get_sentiment("CryptoSlate", cryptoslate_analyzer.get_sentiment)
+        source_results = {
+            "fear_greed": fear_greed_result,
+            "reddit": reddit_result,
+            "CoinTelegraph": rss_1_score,
+            "CryptoSlate": rss_2_score
+        }
+        for name, source_result in source_results.items():
+            if is_stale(source_result):
+                print(f"Warning: Using stale {name} result: {source_result.raw_data['stale_reason']}")
         
         # Get Bitcoin price data
         try:
@@ -55,24 +54,48 @@ def collect_and_append_sentiment():
             print(f"Warning: Failed to fetch price data: {e}")
             price_data = None
         
-        # Calculate weighted scores
-        weighted_fear_greed = fear_greed_score.value * config.sentiment.fear_greed_weight
-        weighted_reddit = reddit_score.value * config.sentiment.reddit_weight
-        weighted_rss_1 = rss_1_score.value * config.sentiment.rss_weight
-        weighted_rss_2 = rss_2_score.value * config.sentiment.rss_2_weight
+        # Per-asset sentiment from the mentions tagged while scoring, next to
+        # the other assets' prices from the same ticker response
+        asset_prices = price_service.parse_asset_prices(price_service.last_payload)
         
-        # Create combined sentiment result
-        combined = CombinedSentiment(
+        # Calculate weighted scores and create combined sentiment result
+        combined = combine_sentiment(
             fear_greed_score=fear_greed_score,
+            reddit_score=reddit_score,
+            rss_1_score=rss_1_score,
+            rss_2_score=rss_2_score,
             price_data=price_data,
-            weighted_fear_greed=weighted_fear_greed,
-            reddit_score=reddit_score.value,
-            rss_1_score=rss_1_score.value,
-            rss_2_score=rss_2_score.value,
-            final_score=weighted_fear_greed + weighted_reddit + weighted_rss_1 + weighted_rss_2,
-            timestamp=datetime.now(tz=timezone('Asia/Singapore'))
+            weights=config.sentiment,
+            timestamp=datetime.now(tz=timezone('Asia/Singapore')),
+            assets=combine_asset_sentiment(source_results, asset_prices)
         )
         
+        # Archive raw inputs so the run can be replayed offline
+        try:
+            snapshot = build_snapshot(
+                timestamp=combined.timestamp,
+                fear_greed_payload=fear_greed_fetcher.last_payload,
+                reddit_posts=reddit_analyzer.last_posts,
+                rss_items={
+                    "CoinTelegraph": cointelegraph_analyzer.scraper.last_raw_items,
+                    "CryptoSlate": cryptoslate_analyzer.scraper.last_raw_items
+                },
+                price_payload=price_service.last_payload,
+                stale_results={
+                    name: source_result for name, source_result in source_results.items()
+                    if is_stale(source_result)
+                }
+            )
+            SnapshotArchive().append(snapshot)
+        except Exception as e:
+            print(f"Warning: Failed to archive raw inputs: {e}")
+        
+        # Record the run locally for the query server
+        try:
+            SentimentHistory().append(build_history_record(combined, source_results))
+        except Exception as e:
+            print(f"Warning: Failed to record sentiment history: {e}")
+        
         # Append to Google Sheets
         result = append_to_sheet(config.api_config.spreadsheet_id, "Sheet1!A:K", [combined.to_sheet_row()])
         
@@ -83,6 +106,8 @@ def collect_and_append_sentiment():
             print(f"CoinTelegraph RSS Score: {combined.rss_1_score:.2f}")
             print(f"CryptoSlate RSS Score: {combined.rss_2_score:.2f}")
             print(f"Final Weighted Score: {combined.final_score:.2f}")
+            for symbol, asset in combined.assets.items():
+                print(f"{symbol} Sentiment: {asset.value:.2f} ({asset.mentions} mentions)")
         else:
             print("Failed to append data to sheets")
             
@@ -0,0 +1,32 @@
+import argparse
+from dataclasses import replace
+
+from src.config import config
+from src.services.history import SentimentHistory
+from src.services.query_server import SentimentQueryServer
+
+def serve(host: str = None, port: int = None, buffer_size: int = None, history_file: str = None):
+    """Serve recent sentiment results over HTTP until interrupted"""
+    settings = replace(
+        config.query_server,
+        host=host or config.query_server.host,
+        port=port or config.query_server.port,
+        buffer_size=buffer_size or config.query_server.buffer_size
+    )
+    server = SentimentQueryServer(settings, SentimentHistory(history_file))
+    print(f"Serving sentiment queries on http://{settings.host}:{settings.port} "
+          f"(/latest, /range, /aggregate, /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recent sentiment results over HTTP/JSON")
+    parser.add_argument("--host", help="Interface to bind")
+    parser.add_argument("--port", type=int, help="Port to listen on")
+    parser.add_argument("--buffer-size", type=int, help="Number of recent runs kept in memory")
+    parser.add_argument("--history-file", help="History file written by the sentiment run")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.buffer_size, args.history_file)
@@ -1,5 +1,5 @@
 """Data models for the sentiment analysis system"""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, Optional
 
@@ -39,6 +39,34 @@ class PriceData:
     change_24h: float
     timestamp: datetime
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict"""
+        return {
+            'current_price': self.current_price,
+            'price_1h': self.price_1h,
+            'price_24h': self.price_24h,
+            'change_1h': self.change_1h,
+            'change_24h': self.change_24h
+        }
+
+@dataclass
+class AssetSentiment:
+    """Sentiment towards a single asset alongside its price"""
+    symbol: str
+    value: float  # Mention-weighted mean across sources, between -1 and 1
+    mentions: int
+    source_values: Dict[str, float]
+    price_data: Optional[PriceData]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict"""
+        return {
+            'value': self.value,
+            'mentions': self.mentions,
+            'sources': self.source_values,
+            'price': self.price_data.to_dict() if self.price_data else None
+        }
+
 @dataclass
 class CombinedSentiment:
     """Combined sentiment analysis result"""
@@ -50,6 +78,7 @@ class CombinedSentiment:
     rss_2_score: float
     final_score: float
     timestamp: datetime
+    assets: Dict[str, AssetSentiment] = field(default_factory=dict)
     
     def to_sheet_row(self) -> list:
         """Convert to Google Sheets row format"""
@@ -66,3 +95,17 @@ class CombinedSentiment:
             self.price_data.price_24h if self.price_data else None,
             f"{self.price_data.change_24h:.2%}" if self.price_data else None
         ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict"""
+        return {
+            'timestamp': self.timestamp.isoformat(),
+            'fear_greed_score': self.fear_greed_score.value,
+            'fear_greed_classification': self.fear_greed_score.classification,
+            'rss_1_score': self.rss_1_score,
+            'rss_2_score': self.rss_2_score,
+            'reddit_score': self.reddit_score,
+            'final_score': self.final_score,
+            'price': self.price_data.to_dict() if self.price_data else None,
+            'assets': {symbol: asset.to_dict() for symbol, asset in self.assets.items()}
+        }
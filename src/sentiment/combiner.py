@@ -0,0 +1,92 @@
+"""Turns per-source sentiment results into a weighted combined score"""
+from datetime import datetime
+from typing import Dict, Optional
+from src.config import SentimentConfig
+from src.models import AssetSentiment, CombinedSentiment, FearGreedScore, PriceData, RedditScore
+from src.sentiment.base_analyzer import SentimentResult
+
+def build_fear_greed_score(result: SentimentResult) -> FearGreedScore:
+    """Convert a Fear & Greed analyzer result into a score model"""
+    return FearGreedScore(
+        value=result.value,
+        raw_value=result.raw_data['original_value'],
+        timestamp=datetime.fromisoformat(result.timestamp),
+        classification=result.classification,
+        interpretation=result.interpretation
+    )
+
+def build_reddit_score(result: SentimentResult) -> RedditScore:
+    """Convert a Reddit analyzer result into a score model"""
+    raw_data = result.raw_data or {}
+    sentiment_dist = raw_data.get('sentiment_distribution', {})
+    total_posts = raw_data.get('total_posts', 0)
+    return RedditScore(
+        value=result.value,
+        raw_value=raw_data.get('average_sentiment', result.value),
+        timestamp=datetime.fromisoformat(result.timestamp),
+        positive_ratio=sentiment_dist.get('Positive', 0) / total_posts if total_posts > 0 else 0,
+        negative_ratio=sentiment_dist.get('Negative', 0) / total_posts if total_posts > 0 else 0,
+        neutral_ratio=sentiment_dist.get('Neutral', 0) / total_posts if total_posts > 0 else 0,
+        post_count=total_posts
+    )
+
+def combine_asset_sentiment(source_results: Dict[str, SentimentResult],
+                            asset_prices: Optional[Dict[str, PriceData]] = None) -> Dict[str, AssetSentiment]:
+    """Merge per-asset tallies from each source, weighting sources by mentions
+
+    Args:
+        source_results: Analyzer results keyed by source name; results
+            without an ``assets`` entry in raw_data are ignored
+        asset_prices: Parsed ticker prices keyed by symbol
+
+    Returns:
+        Per-asset sentiment for every asset mentioned by any source, most
+        mentioned first
+    """
+    totals: Dict[str, float] = {}
+    mentions: Dict[str, int] = {}
+    source_values: Dict[str, Dict[str, float]] = {}
+    for source, result in source_results.items():
+        for symbol, tally in ((result.raw_data or {}).get('assets') or {}).items():
+            totals[symbol] = totals.get(symbol, 0.0) + tally['sentiment'] * tally['mentions']
+            mentions[symbol] = mentions.get(symbol, 0) + tally['mentions']
+            source_values.setdefault(symbol, {})[source] = tally['sentiment']
+
+    asset_prices = asset_prices or {}
+    return {
+        symbol: AssetSentiment(
+            symbol=symbol,
+            value=totals[symbol] / count,
+            mentions=count,
+            source_values=source_values[symbol],
+            price_data=asset_prices.get(symbol)
+        )
+        for symbol, count in sorted(mentions.items(), key=lambda entry: -entry[1])
+        if count
+    }
+
+def combine_sentiment(fear_greed_score: FearGreedScore,
+                      reddit_score: RedditScore,
+                      rss_1_score: SentimentResult,
+                      rss_2_score: SentimentResult,
+                      price_data: Optional[PriceData],
+                      weights: SentimentConfig,
+                      timestamp: datetime,
+                      assets: Optional[Dict[str, AssetSentiment]] = None) -> CombinedSentiment:
+    """Apply the configured source weights and build the combined result"""
+    weighted_fear_greed = fear_greed_score.value * weights.fear_greed_weight
+    weighted_reddit = reddit_score.value * weights.reddit_weight
+    weighted_rss_1 = rss_1_score.value * weights.rss_weight
+    weighted_rss_2 = rss_2_score.value * weights.rss_2_weight
+
+    return CombinedSentiment(
+        fear_greed_score=fear_greed_score,
+        price_data=price_data,
+        weighted_fear_greed=weighted_fear_greed,
+        reddit_score=reddit_score.value,
+        rss_1_score=rss_1_score.value,
+        rss_2_score=rss_2_score.value,
+        final_score=weighted_fear_greed + weighted_reddit + weighted_rss_1 + weighted_rss_2,
+        timestamp=timestamp,
+        assets=assets or {}
+    )
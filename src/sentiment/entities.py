@@ -0,0 +1,108 @@
+"""Tagging of asset mentions and per-asset sentiment aggregation"""
+import math
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.sentiment.phrases import PhraseMatcher
+
+ASSETS_PATH = Path(__file__).parent / 'data' / 'crypto_assets.tsv'
+
+TOKEN_PATTERN = re.compile(r"\$?[A-Za-z][A-Za-z0-9]*")
+
+# Cap on memoized items per index, so long-lived processes do not grow without bound
+MAX_CACHED_ITEMS = 65536
+
+def entity_tokens(text: str) -> List[str]:
+    """Tokens for tagging, lowercased except for tickers
+
+    Cashtags always become tickers. All-caps words keep their capitals, and
+    so can match tickers, only when the text also has lowercase letters.
+    In an all-caps headline they are lowercased like the rest, so words
+    such as DOT or LINK only match through a cashtag.
+    """
+    shouting = text.isupper()
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        if token[0] == '$':
+            tokens.append(token[1:].upper())
+        elif token.isupper() and not shouting:
+            tokens.append(token)
+        else:
+            tokens.append(token.lower())
+    return tokens
+
+def parse_assets_text(text: str) -> Dict[str, List[str]]:
+    """Parse ``ticker<TAB>alias, alias`` lines, skipping ``#`` comments"""
+    assets = {}
+    for line in text.split('\n'):
+        if not line.strip() or line.startswith('#'):
+            continue
+        symbol, _, aliases = line.strip().partition('\t')
+        assets[symbol.upper()] = [alias.strip() for alias in aliases.split(',') if alias.strip()]
+    return assets
+
+class EntityIndex:
+    """Maps tickers, names and aliases of every asset to its ticker
+
+    All names are compiled into one automaton, so tagging a text costs a
+    single pass over its tokens however many assets are indexed. Tags are
+    memoized per item, since feed items and posts repeat across runs and
+    replayed snapshots.
+    """
+
+    def __init__(self, assets: Dict[str, List[str]]):
+        phrases = {}
+        for symbol, aliases in assets.items():
+            phrases[symbol.upper()] = symbol.upper()
+            for alias in aliases:
+                # Aliases match capitalised, lowercase or all-caps within
+                # mixed-case text, so index both forms
+                phrases[alias.lower()] = symbol.upper()
+                phrases[alias.upper()] = symbol.upper()
+        self.matcher = PhraseMatcher(phrases, tokenize=str.split)
+        self.symbols = frozenset(phrases.values())
+        self._cache: Dict[Tuple[Optional[str], ...], Tuple[str, ...]] = {}
+
+    def tag(self, *texts: Optional[str]) -> Tuple[str, ...]:
+        """Sorted tickers of the assets mentioned in any of the texts, memoized"""
+        symbols = self._cache.get(texts)
+        if symbols is None:
+            symbols = tuple(sorted({
+                symbol
+                for text in texts if text
+                for _, _, symbol in self.matcher.find(entity_tokens(text))
+            }))
+            if len(self._cache) >= MAX_CACHED_ITEMS:
+                self._cache.clear()
+            self._cache[texts] = symbols
+        return symbols
+
+@lru_cache(maxsize=None)
+def load_entity_index() -> EntityIndex:
+    """Process-wide index over the shipped assets table"""
+    text = ASSETS_PATH.read_text(encoding='utf-8') if ASSETS_PATH.exists() else ''
+    return EntityIndex(parse_assets_text(text))
+
+def asset_summary(tags: Iterable[Tuple[str, ...]], sentiments: Iterable[float]) -> Dict[str, Dict[str, Any]]:
+    """Mention count and mean sentiment per asset, for ``raw_data``
+
+    Args:
+        tags: Tickers mentioned by each item, as returned by EntityIndex.tag
+        sentiments: Sentiment of each item, in the same order; NaN items are skipped
+
+    Returns:
+        Tally per ticker, most mentioned first
+    """
+    sums: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for symbols, sentiment in zip(tags, sentiments):
+        if not symbols or math.isnan(sentiment):
+            continue
+        for symbol in symbols:
+            sums[symbol] = sums.get(symbol, 0.0) + sentiment
+            counts[symbol] = counts.get(symbol, 0) + 1
+    return {
+        symbol: {'mentions': count, 'sentiment': float(sums[symbol] / count)}
+        for symbol, count in sorted(counts.items(), key=lambda entry: -entry[1])
+    }
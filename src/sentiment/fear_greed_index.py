@@ -1,10 +1,10 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Optional
-import requests
 from src.config import config
 from src.sentiment.base_analyzer import BaseSentimentAnalyzer, SentimentResult
 from src.utils.errors.exceptions import FearGreedFetchError
+from src.utils.http.hedging import hedged_get
 
 class FearGreedFetcher(ABC):
     """Abstract base class for fear and greed data fetching"""
@@ -15,8 +15,11 @@ class FearGreedFetcher(ABC):
 
 class CNNFearGreedFetcher(FearGreedFetcher):
     """Fetches fear and greed data from CNN's API"""
-    def __init__(self, api_url: str = config.api_config.fng_api_url):
+    def __init__(self, api_url: str = config.api_config.fng_api_url,
+                 hedge_after: Optional[float] = config.source_cache.hedge_after):
         self.api_url = api_url
+        self.hedge_after = hedge_after
+        self.last_payload: Optional[dict] = None
         
     def _get_interpretation(self, classification: str) -> str:
         """Interpret the fear and greed classification"""
@@ -31,28 +34,34 @@ class CNNFearGreedFetcher(FearGreedFetcher):
             
     def fetch_data(self, timeout: Optional[float] = None) -> SentimentResult:
         try:
-            response = requests.get(self.api_url, timeout=timeout)
+            self.last_payload = None
+            response = hedged_get(self.api_url, hedge_after=self.hedge_after,
+                                  timeout=timeout or config.source_cache.request_timeout)
             response.raise_for_status()
-            data = response.json()
+            self.last_payload = response.json()
             
-            # Extract the latest data point
-            latest = data['data'][0]
-            # Convert value from [0, 100] to [-1, 1]
-            normalized_value = (float(latest['value']) / 50.0) - 1.0
-            
-            # Convert Unix timestamp to ISO format
-            timestamp = datetime.fromtimestamp(int(latest['timestamp'])).isoformat()
-            
-            return SentimentResult(
-                value=normalized_value,
-                classification=latest['value_classification'],
-                interpretation=self._get_interpretation(latest['value_classification']),
-                raw_data={'original_value': float(latest['value'])},
-                timestamp=timestamp
-            )
+            return self.parse_payload(self.last_payload)
         except Exception as e:
             raise FearGreedFetchError(f"Failed to fetch fear and greed data: {str(e)}")
 
+    def parse_payload(self, data: dict) -> SentimentResult:
+        """Convert a raw API response into a sentiment result"""
+        # Extract the latest data point
+        latest = data['data'][0]
+        # Convert value from [0, 100] to [-1, 1]
+        normalized_value = (float(latest['value']) / 50.0) - 1.0
+        
+        # Convert Unix timestamp to ISO format
+        timestamp = datetime.fromtimestamp(int(latest['timestamp'])).isoformat()
+        
+        return SentimentResult(
+            value=normalized_value,
+            classification=latest['value_classification'],
+            interpretation=self._get_interpretation(latest['value_classification']),
+            raw_data={'original_value': float(latest['value'])},
+            timestamp=timestamp
+        )
+
 class FearGreedAnalyzer(BaseSentimentAnalyzer):
     """Analyzes fear and greed data using the base analyzer framework"""
     def __init__(self, fetcher: FearGreedFetcher):
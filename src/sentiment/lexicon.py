@@ -0,0 +1,190 @@
+"""Precompiled VADER lexicon artifact with crypto-specific overrides
+
+The artifact is a little-endian binary file:
+
+    magic      4 bytes   b'VLEX'
+    version    uint32    FORMAT_VERSION
+    count      uint32    number of entries
+    words_len  uint32    byte length of the words blob
+    vader      32 bytes  sha256 of the NLTK VADER lexicon
+    overrides  32 bytes  sha256 of the crypto overrides
+    values     float64[count]
+    words      utf-8, newline separated, same order as values
+
+The values block is 8-byte aligned so it can be viewed straight from a
+memory map without copying. The overrides digest is checked on load, so
+editing the overrides without recompiling falls back to the sources
+instead of serving stale values.
+"""
+import hashlib
+import mmap
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import nltk
+import numpy as np
+from nltk.sentiment import SentimentIntensityAnalyzer
+from nltk.sentiment.vader import VaderConstants
+from src.config import config
+from src.sentiment.phrases import PhraseMatcher
+from src.utils.errors.exceptions import ConfigurationError
+
+FORMAT_VERSION = 2
+MAGIC = b'VLEX'
+HEADER = struct.Struct('<4sIII32s32s')
+
+DATA_DIR = Path(__file__).parent / 'data'
+ARTIFACT_PATH = DATA_DIR / 'vader_crypto.lex'
+OVERRIDES_PATH = DATA_DIR / 'crypto_lexicon_overrides.tsv'
+PHRASES_PATH = DATA_DIR / 'crypto_phrases.tsv'
+VADER_RESOURCE = 'sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt'
+
+def parse_lexicon_text(text: str, comments: bool = False) -> Dict[str, float]:
+    """Parse VADER-style ``token<TAB>valence`` lines
+
+    VADER itself has emoticon tokens starting with ``#``, so comment lines
+    are only skipped when ``comments`` is set.
+    """
+    lexicon = {}
+    for line in text.split('\n'):
+        if not line.strip() or (comments and line.startswith('#')):
+            continue
+        word, measure = line.strip().split('\t')[0:2]
+        lexicon[word] = float(measure)
+    return lexicon
+
+def _digest(text: str) -> bytes:
+    """sha256 of a source text"""
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+def _load_overrides_text() -> str:
+    """Raw text of the crypto overrides, empty when not shipped"""
+    return OVERRIDES_PATH.read_text(encoding='utf-8') if OVERRIDES_PATH.exists() else ''
+
+def _load_source_texts() -> Tuple[str, str]:
+    """Raw text of the NLTK VADER lexicon and the crypto overrides"""
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon', quiet=True)
+    vader_text = nltk.data.load(VADER_RESOURCE, format='text')
+    return vader_text, _load_overrides_text()
+
+def build_lexicon_artifact(path: Optional[Path] = None) -> Path:
+    """Compile the VADER lexicon plus overrides into the binary artifact"""
+    return write_lexicon_artifact(Path(path or ARTIFACT_PATH), *_load_source_texts())
+
+def write_lexicon_artifact(path: Path, vader_text: str, overrides_text: str) -> Path:
+    """Compile lexicon source texts into an artifact at ``path``"""
+    path = Path(path)
+    lexicon = parse_lexicon_text(vader_text)
+    lexicon.update(parse_lexicon_text(overrides_text, comments=True))
+
+    words = '\n'.join(lexicon).encode('utf-8')
+    values = np.array(list(lexicon.values()), dtype='<f8')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(lexicon), len(words),
+                            _digest(vader_text), _digest(overrides_text)))
+        f.write(values.tobytes())
+        f.write(words)
+    return path
+
+def read_artifact_header(path: Optional[Path] = None) -> Tuple[int, int, str, str]:
+    """Format version, entry count, VADER digest and overrides digest of an artifact"""
+    with open(Path(path or ARTIFACT_PATH), 'rb') as f:
+        _, version, count, _, vader_digest, overrides_digest = HEADER.unpack(f.read(HEADER.size))
+    return version, count, vader_digest.hex(), overrides_digest.hex()
+
+def artifact_is_current(path: Optional[Path] = None) -> bool:
+    """Whether an artifact exists in the current format for the current overrides"""
+    try:
+        version, _, _, overrides_digest = read_artifact_header(path)
+    except (OSError, struct.error):
+        return False
+    return version == FORMAT_VERSION and overrides_digest == _digest(_load_overrides_text()).hex()
+
+def read_lexicon_artifact(path: Optional[Path] = None, overrides_text: Optional[str] = None) -> Dict[str, float]:
+    """Load a compiled lexicon through a read-only memory map
+
+    When ``overrides_text`` is given, an artifact compiled from different
+    overrides is rejected as stale.
+    """
+    path = Path(path or ARTIFACT_PATH)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        magic, version, count, words_len, _, overrides_digest = HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ConfigurationError(f"Unsupported lexicon artifact {path} (version {version})")
+        if overrides_text is not None and overrides_digest != _digest(overrides_text):
+            raise ConfigurationError(
+                f"Lexicon artifact {path} is stale, the overrides changed since it was compiled "
+                f"(run python src/exec/build_lexicon.py)"
+            )
+        values = np.frombuffer(mapped, dtype='<f8', count=count, offset=HEADER.size).tolist()
+        words_start = HEADER.size + 8 * count
+        words = mapped[words_start:words_start + words_len].decode('utf-8').split('\n')
+    return dict(zip(words, values))
+
+@lru_cache(maxsize=None)
+def load_lexicon() -> Dict[str, float]:
+    """Process-wide lexicon, from the artifact when shipped, else from NLTK
+
+    The returned dict is shared by every analyzer and must not be mutated.
+    """
+    if ARTIFACT_PATH.exists():
+        try:
+            return read_lexicon_artifact(overrides_text=_load_overrides_text())
+        except (ConfigurationError, OSError, ValueError, struct.error) as e:
+            print(f"Warning: Falling back to NLTK lexicon: {e}")
+
+    vader_text, overrides_text = _load_source_texts()
+    lexicon = parse_lexicon_text(vader_text)
+    lexicon.update(parse_lexicon_text(overrides_text, comments=True))
+    return lexicon
+
+@lru_cache(maxsize=None)
+def load_phrase_matcher() -> PhraseMatcher:
+    """Process-wide automaton over the crypto phrase table"""
+    text = PHRASES_PATH.read_text(encoding='utf-8') if PHRASES_PATH.exists() else ''
+    return PhraseMatcher(parse_lexicon_text(text, comments=True))
+
+class CompiledLexiconAnalyzer(SentimentIntensityAnalyzer):
+    """VADER analyzer that skips parsing and uses the shared compiled lexicon"""
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        self.lexicon_file = None
+        self.lexicon = lexicon if lexicon is not None else load_lexicon()
+        self.constants = VaderConstants()
+
+class DomainSentimentAnalyzer(CompiledLexiconAnalyzer):
+    """Compiled-lexicon analyzer that also scores crypto phrases
+
+    Phrases are matched over VADER's own tokens in a single automaton pass.
+    A matched phrase replaces the valences of the words it spans, so
+    'pump and dump' counts once as a phrase, is flipped by a negation in
+    the three words before it and is still weighted by VADER's 'but' rule.
+    """
+
+    def __init__(self,
+                 lexicon: Optional[Dict[str, float]] = None,
+                 phrases: Optional[PhraseMatcher] = None):
+        super().__init__(lexicon)
+        self.phrases = phrases if phrases is not None else load_phrase_matcher()
+
+    def _but_check(self, words_and_emoticons, sentiments):
+        """Apply phrase valences, then VADER's contrastive 'but' weighting"""
+        words = [word.lower() for word in words_and_emoticons]
+        for start, end, valence in self.phrases.find(words):
+            # Same three-word negation window VADER uses for single words
+            if self.constants.negated(words[max(0, start - 3):start]):
+                valence *= self.constants.N_SCALAR
+            sentiments[start:end] = [valence] + [0] * (end - start - 1)
+        return super()._but_check(words_and_emoticons, sentiments)
+
+def create_sentiment_analyzer() -> SentimentIntensityAnalyzer:
+    """Analyzer used by every sentiment source"""
+    if config.sentiment.domain_phrases:
+        return DomainSentimentAnalyzer()
+    return CompiledLexiconAnalyzer()
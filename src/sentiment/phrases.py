@@ -0,0 +1,94 @@
+"""Multi-word phrase matching over token sequences
+
+Phrases are compiled into an Aho-Corasick automaton whose alphabet is
+whole tokens rather than characters, so matches always fall on word
+boundaries and one pass over a text finds every phrase regardless of how
+many phrases are loaded. The same automaton scores sentiment phrases and
+tags asset mentions.
+"""
+from collections import deque
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+def phrase_tokens(phrase: str) -> Tuple[str, ...]:
+    """Tokens of a phrase as VADER sees them: lowercased, singletons dropped"""
+    return tuple(token for token in phrase.lower().split() if len(token) > 1)
+
+class PhraseMatcher:
+    """Token-level Aho-Corasick automaton mapping phrases to values"""
+
+    def __init__(self,
+                 phrases: Dict[str, Any],
+                 tokenize: Callable[[str], Sequence[str]] = phrase_tokens):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (phrase length, value) for every phrase ending at a state, longest first
+        self._out: List[Tuple[Tuple[int, Any], ...]] = [()]
+        self.size = 0
+        for phrase, value in phrases.items():
+            tokens = tuple(tokenize(phrase))
+            if tokens:
+                self._add(tokens, value)
+        self._link()
+        self._first_tokens = frozenset(self._goto[0])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _add(self, tokens: Tuple[str, ...], value: Any):
+        """Insert one phrase into the trie"""
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][token] = next_state
+            state = next_state
+        if not self._out[state]:
+            self.size += 1
+        self._out[state] = ((len(tokens), value),)
+
+    def _link(self):
+        """Breadth-first pass setting failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+
+    def find(self, tokens: Sequence[str]) -> List[Tuple[int, int, Any]]:
+        """Leftmost-longest non-overlapping matches as (start, end, value)
+
+        ``tokens`` must be normalized the same way as the phrases were.
+        """
+        # Most texts contain no phrase at all; skip the walk when no token can start one
+        if self._first_tokens.isdisjoint(tokens):
+            return []
+
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, value in out[state]:
+                matches.append((i + 1 - length, i + 1, value))
+
+        if len(matches) < 2:
+            return matches
+        selected = []
+        covered = 0
+        for start, end, value in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+            if start >= covered:
+                selected.append((start, end, value))
+                covered = end
+        return selected
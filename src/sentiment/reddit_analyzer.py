@@ -1,33 +1,43 @@
 import praw
+import numpy as np
 import pandas as pd
-import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
 import os
 from dotenv import load_dotenv
+from typing import Any, Dict, List, Optional, Tuple
+from src.config import config
 from src.sentiment.base_analyzer import BaseSentimentAnalyzer, SentimentResult
+from src.sentiment.entities import EntityIndex, asset_summary, load_entity_index
+from src.sentiment.lexicon import create_sentiment_analyzer
+from src.sentiment.scoring import AdaptiveSampler, default_sampler
 from datetime import datetime
 
 class RedditSentimentAnalyzer(BaseSentimentAnalyzer):
     """Reddit sentiment analyzer for cryptocurrency discussions"""
     
-    def __init__(self):
+    def __init__(self,
+                 sia: Optional[SentimentIntensityAnalyzer] = None,
+                 sampler: Optional[AdaptiveSampler] = None,
+                 entities: Optional[EntityIndex] = None):
         """Initialize with environment variables for API credentials"""
         load_dotenv()
         
-        self._initialize_nltk()
-        self._initialize_reddit()
-        self.sia = SentimentIntensityAnalyzer()
+        self.sia = sia or create_sentiment_analyzer()
+        self.sampler = sampler or default_sampler(config.sentiment.reddit_post_limit)
+        self.entities = entities or load_entity_index()
+        self._reddit = None
+        self.last_posts: List[Dict[str, Any]] = []
     
-    def _initialize_nltk(self):
-        """Download required NLTK data"""
-        try:
-            nltk.data.find('sentiment/vader_lexicon.zip')
-        except LookupError:
-            nltk.download('vader_lexicon', quiet=True)
+    @property
+    def reddit(self) -> praw.Reddit:
+        """Reddit API connection, created on first use"""
+        if self._reddit is None:
+            self._initialize_reddit()
+        return self._reddit
     
     def _initialize_reddit(self):
         """Initialize Reddit API connection"""
-        self.reddit = praw.Reddit(
+        self._reddit = praw.Reddit(
             client_id=os.getenv('REDDIT_CLIENT_ID'),
             client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
             user_agent=os.getenv('REDDIT_USER_AGENT'),
@@ -35,49 +45,61 @@ class RedditSentimentAnalyzer(BaseSentimentAnalyzer):
             check_for_async=False  # Explicitly disable async check
         )
     
-    def scrape_posts(self, 
-                    query: str = 'bitcoin', 
-                    limit: int = 100, 
+    def fetch_posts(self,
+                    limit: int = 100,
                     subreddit: str = 'CryptoCurrency',
-                    sort: str = 'new') -> pd.DataFrame:
+                    sort: str = 'new',
+                    after: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Scrape and analyze Reddit posts
+        Fetch raw Reddit posts without scoring them
         
         Args:
-            query: Search query string
             limit: Maximum number of posts to retrieve
             subreddit: Subreddit to fetch posts from
             sort: Sorting method ('new', 'hot', 'top', 'rising')
+            after: Fullname of the post to continue the listing after
             
         Returns:
-            DataFrame containing post data and sentiment analysis
+            List of post dicts with name, title, text, score and num_comments
         """
-        posts_data = []
         subreddit_instance = self.reddit.subreddit(subreddit)
+        params = {'after': after} if after else None
         
         # Get posts based on sort method
         if sort == 'new':
-            submissions = subreddit_instance.new(limit=limit)
+            submissions = subreddit_instance.new(limit=limit, params=params)
         elif sort == 'hot':
-            submissions = subreddit_instance.hot(limit=limit)
+            submissions = subreddit_instance.hot(limit=limit, params=params)
         elif sort == 'top':
-            submissions = subreddit_instance.top(limit=limit)
+            submissions = subreddit_instance.top(limit=limit, params=params)
         elif sort == 'rising':
-            submissions = subreddit_instance.rising(limit=limit)
+            submissions = subreddit_instance.rising(limit=limit, params=params)
         else:
-            submissions = subreddit_instance.new(limit=limit)
+            submissions = subreddit_instance.new(limit=limit, params=params)
         
-        for submission in submissions:
+        return [
+            {
+                'name': submission.name,
+                'title': submission.title,
+                'text': submission.selftext,
+                'score': submission.score,
+                'num_comments': submission.num_comments
+            }
+            for submission in submissions
+        ]
+    
+    def score_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Attach title and content sentiment scores and mentioned assets to raw posts"""
+        posts_data = []
+        for post in posts:
             # Analyze sentiment
-            title_sentiment = self.sia.polarity_scores(submission.title)
-            selftext_sentiment = self.sia.polarity_scores(submission.selftext) if submission.selftext else None
+            title_sentiment = self.sia.polarity_scores(post['title'])
+            selftext_sentiment = self.sia.polarity_scores(post['text']) if post['text'] else None
             
             # Compile post data
             post_data = {
-                'title': submission.title,
-                'text': submission.selftext,
-                'score': submission.score,
-                'num_comments': submission.num_comments,
+                **post,
+                'assets': self.entities.tag(post['title'], post['text']),
                 'title_sentiment_compound': title_sentiment['compound'],
                 'title_sentiment_pos': title_sentiment['pos'],
                 'title_sentiment_neg': title_sentiment['neg'],
@@ -94,64 +116,50 @@ class RedditSentimentAnalyzer(BaseSentimentAnalyzer):
             
             posts_data.append(post_data)
         
-        return pd.DataFrame(posts_data)
+        return posts_data
+    
+    def scrape_posts(self, 
+                    query: str = 'bitcoin', 
+                    limit: int = 100, 
+                    subreddit: str = 'CryptoCurrency',
+                    sort: str = 'new') -> pd.DataFrame:
+        """
+        Scrape and analyze Reddit posts
+        
+        Args:
+            query: Asset ticker, name or alias to keep posts about, or None
+                to keep every post
+            limit: Maximum number of posts to retrieve
+            subreddit: Subreddit to fetch posts from
+            sort: Sorting method ('new', 'hot', 'top', 'rising')
+            
+        Returns:
+            DataFrame containing post data and sentiment analysis
+        """
+        symbols = frozenset(self.entities.tag(query)) if query else frozenset()
+        if query and not symbols:
+            raise ValueError(f"'{query}' does not name a known asset")
+        
+        self.last_posts = []
+        self.last_posts = self.fetch_posts(limit=limit, subreddit=subreddit, sort=sort)
+        scored = self.score_posts(self.last_posts)
+        if symbols:
+            scored = [post for post in scored if symbols.intersection(post['assets'])]
+        return pd.DataFrame(scored)
     
     def get_sentiment(self) -> SentimentResult:
         """Get sentiment analysis from Reddit posts"""
         try:
             # Fetch and analyze posts
-            df = self.scrape_posts()
-            if df.empty:
-                return SentimentResult(
-                    value=0.0,
-                    classification="Neutral",
-                    interpretation="No data available for analysis",
-                    raw_data={'error': 'No data available'},
-                    timestamp=datetime.now().isoformat()
-                )
-            
-            def categorize_sentiment(score):
-                if score > 0.05:
-                    return 'Positive'
-                elif score < -0.05:
-                    return 'Negative'
-                return 'Neutral'
-            
-            # Calculate combined sentiment from both title and content
-            title_sentiments = df['title_sentiment_compound']
-            content_sentiments = df.get('text_sentiment_compound', pd.Series([0] * len(df)))
-            
-            # Weight title sentiment more heavily (0.6) than content sentiment (0.4)
-            combined_sentiments = title_sentiments * 0.6 + content_sentiments * 0.4
-            
-            # Calculate sentiment distribution using combined sentiment
-            sentiment_counts = combined_sentiments.apply(categorize_sentiment).value_counts()
-            
-            # Use combined sentiment for the overall value
-            sentiment_value = combined_sentiments.mean()
-            classification = self.classify_sentiment(sentiment_value)
-            
-            interpretation = f"{classification} - Reddit sentiment is "
-            if sentiment_value > 0:
-                interpretation += "positive, showing optimistic market signals"
-            elif sentiment_value < 0:
-                interpretation += "negative, showing pessimistic market signals"
-            else:
-                interpretation += "neutral, showing balanced market signals"
-                
-            return SentimentResult(
-                value=sentiment_value,
-                classification=classification,
-                interpretation=interpretation,
-                raw_data={
-                    'total_posts': len(df),
-                    'sentiment_distribution': sentiment_counts.to_dict(),
-                    'average_sentiment': sentiment_value,
-                    'title_sentiment_mean': title_sentiments.mean(),
-                    'content_sentiment_mean': content_sentiments.mean()
-                },
-                timestamp=datetime.now().isoformat()
+            self.last_posts = []
+            if self.sampler:
+                return self.summarize_posts(self._sample_posts())
+            self.last_posts = self.fetch_posts(
+                limit=config.sentiment.reddit_post_limit,
+                subreddit=config.sentiment.reddit_default_subreddit,
+                sort=config.sentiment.reddit_default_sort
             )
+            return self.analyze_posts(self.last_posts)
             
         except Exception as e:
             return SentimentResult(
@@ -162,7 +170,117 @@ class RedditSentimentAnalyzer(BaseSentimentAnalyzer):
                 timestamp=datetime.now().isoformat()
             )
     
+    def _sample_posts(self) -> List[Dict[str, Any]]:
+        """Fetch and score pages of posts until the mean sentiment converges"""
+        # A sampler without its own cap still stops at the configured post limit
+        max_items = self.sampler.max_items
+        if max_items is None:
+            max_items = config.sentiment.reddit_post_limit
+        scored = []
+        after = None
+        while True:
+            page_limit = min(self.sampler.page_size, max_items - len(scored))
+            page = self.fetch_posts(
+                limit=page_limit,
+                subreddit=config.sentiment.reddit_default_subreddit,
+                sort=config.sentiment.reddit_default_sort,
+                after=after
+            )
+            self.last_posts.extend(page)
+            scored.extend(self.score_posts(page))
+            
+            _, _, combined_sentiments = _combine_post_sentiments(scored)
+            if (len(page) < page_limit or len(scored) >= max_items
+                    or self.sampler.is_done(combined_sentiments, len(scored))):
+                return scored
+            after = page[-1]['name']
+    
+    def analyze_posts(self, posts: List[Dict[str, Any]], timestamp: Optional[str] = None) -> SentimentResult:
+        """Score raw posts and aggregate them without touching the network"""
+        return self.summarize_posts(self.score_posts(posts), timestamp=timestamp)
+    
+    def summarize_posts(self, scored: List[Dict[str, Any]], timestamp: Optional[str] = None) -> SentimentResult:
+        """Aggregate already-scored posts into a sentiment result"""
+        timestamp = timestamp or datetime.now().isoformat()
+        if not scored:
+            return SentimentResult(
+                value=0.0,
+                classification="Neutral",
+                interpretation="No data available for analysis",
+                raw_data={'error': 'No data available'},
+                timestamp=timestamp
+            )
+        
+        title_sentiments, content_sentiments, combined_sentiments = _combine_post_sentiments(scored)
+        
+        # Credit each post to the assets it mentions; link posts have no
+        # content score, so they count with their title score alone
+        has_content = np.array(['text_sentiment_compound' in post for post in scored], dtype=bool)
+        asset_sentiments = np.where(has_content, combined_sentiments, title_sentiments)
+        
+        # Calculate sentiment distribution using combined sentiment
+        positive = int(np.count_nonzero(combined_sentiments > 0.05))
+        negative = int(np.count_nonzero(combined_sentiments < -0.05))
+        neutral = len(scored) - positive - negative
+        sentiment_counts = {
+            label: count
+            for label, count in (('Positive', positive), ('Negative', negative), ('Neutral', neutral))
+            if count
+        }
+        
+        # Use combined sentiment for the overall value
+        sentiment_value = _nanmean(combined_sentiments)
+        classification = self.classify_sentiment(sentiment_value)
+        
+        interpretation = f"{classification} - Reddit sentiment is "
+        if sentiment_value > 0:
+            interpretation += "positive, showing optimistic market signals"
+        elif sentiment_value < 0:
+            interpretation += "negative, showing pessimistic market signals"
+        else:
+            interpretation += "neutral, showing balanced market signals"
+            
+        raw_data = {
+            'total_posts': len(scored),
+            'sentiment_distribution': sentiment_counts,
+            'average_sentiment': sentiment_value,
+            'title_sentiment_mean': _nanmean(title_sentiments),
+            'content_sentiment_mean': _nanmean(content_sentiments),
+            'assets': asset_summary((post.get('assets', ()) for post in scored), asset_sentiments.tolist())
+        }
+        if self.sampler:
+            raw_data['sampling'] = self.sampler.report(combined_sentiments, len(scored))
+            
+        return SentimentResult(
+            value=sentiment_value,
+            classification=classification,
+            interpretation=interpretation,
+            raw_data=raw_data,
+            timestamp=timestamp
+        )
+    
     def save_results(self, df: pd.DataFrame, filename: str = 'reddit_sentiment_results.csv'):
         """Save analysis results to CSV"""
         df.to_csv(filename, index=False)
-        print(f"Results saved to {filename}")
\ No newline at end of file
+        print(f"Results saved to {filename}")
+
+def _combine_post_sentiments(scored: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Title, content and combined compound scores of scored posts"""
+    # Posts without text have no content score; when any post has text those
+    # are NaN and drop out of the means, otherwise content counts as 0.
+    title_sentiments = np.array([post['title_sentiment_compound'] for post in scored], dtype=float)
+    if any('text_sentiment_compound' in post for post in scored):
+        content_sentiments = np.array(
+            [post.get('text_sentiment_compound', np.nan) for post in scored], dtype=float
+        )
+    else:
+        content_sentiments = np.zeros(len(scored))
+    
+    # Weight title sentiment more heavily (0.6) than content sentiment (0.4)
+    combined_sentiments = title_sentiments * 0.6 + content_sentiments * 0.4
+    return title_sentiments, content_sentiments, combined_sentiments
+
+def _nanmean(values: np.ndarray) -> float:
+    """Mean that skips NaN like pandas does, NaN when nothing is left"""
+    mask = ~np.isnan(values)
+    return float(values[mask].mean()) if mask.any() else float('nan')
@@ -1,11 +1,16 @@
 from dataclasses import dataclass
 from datetime import datetime
-import requests
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 import json
+import numpy as np
 from nltk.sentiment import SentimentIntensityAnalyzer
 from src.sentiment.base_analyzer import BaseSentimentAnalyzer, SentimentResult
+from src.sentiment.entities import EntityIndex, asset_summary, load_entity_index
+from src.sentiment.lexicon import create_sentiment_analyzer
+from src.sentiment.scoring import AdaptiveSampler, default_sampler
 from src.config import config
+from src.utils.http.hedging import hedged_get
 
 @dataclass
 class RSSItem:
@@ -20,23 +25,47 @@ class RSSItem:
     authors: List[Dict[str, str]]
     attachments: List[Dict[str, str]]
 
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[datetime]:
+    """Parse date string, memoized since feed items repeat across runs"""
+    date_formats = [
+        '%Y-%m-%dT%H:%M:%S.%fZ',  # Standard ISO format with microseconds
+        '%Y-%m-%dT%H:%M:%SZ',     # ISO format without microseconds
+        '%Y-%m-%d %H:%M:%S',      # Basic datetime format
+        '%Y-%m-%d'                # Just date
+    ]
+    
+    for date_format in date_formats:
+        try:
+            return datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+    return None
+
 class RSSFeedError(Exception):
     """Custom exception for RSS feed errors"""
     pass
 
 class RSSFeedScraper:
     """Scrapes and processes RSS feed data"""
-    def __init__(self, feed_url: str = config.api_config.reddit_rss_feed_url):
+    def __init__(self, feed_url: str = config.api_config.reddit_rss_feed_url,
+                 hedge_after: Optional[float] = config.source_cache.hedge_after,
+                 timeout: Optional[float] = config.source_cache.request_timeout):
         self.feed_url = feed_url
+        self.hedge_after = hedge_after
+        self.timeout = timeout
+        self.last_raw_items: List[dict] = []
 
     def fetch_feed(self) -> List[RSSItem]:
         """Fetch and parse RSS feed data"""
         try:
-            response = requests.get(self.feed_url)
+            self.last_raw_items = []
+            response = hedged_get(self.feed_url, hedge_after=self.hedge_after, timeout=self.timeout)
             response.raise_for_status()
             feed_data = response.json()
             
-            return self._parse_items(feed_data.get('items', []))
+            self.last_raw_items = feed_data.get('items', [])
+            return self.parse_items(self.last_raw_items)
         except Exception as e:
             raise RSSFeedError(f"Failed to fetch RSS feed: {str(e)}")
 
@@ -44,23 +73,10 @@ class RSSFeedScraper:
         """Parse date string with multiple format attempts"""
         if not date_str:
             return None
-            
-        date_formats = [
-            '%Y-%m-%dT%H:%M:%S.%fZ',  # Standard ISO format with microseconds
-            '%Y-%m-%dT%H:%M:%SZ',     # ISO format without microseconds
-            '%Y-%m-%d %H:%M:%S',      # Basic datetime format
-            '%Y-%m-%d'                # Just date
-        ]
-        
-        for date_format in date_formats:
-            try:
-                return datetime.strptime(date_str, date_format)
-            except ValueError:
-                continue
-        return None
+        return _parse_date_cached(date_str)
 
-    def _parse_items(self, items: List[dict]) -> List[RSSItem]:
-        """Parse RSS items into RSSItem objects"""
+    def parse_items(self, items: List[dict]) -> List[RSSItem]:
+        """Parse raw feed items, live or archived, into RSSItem objects"""
         parsed_items = []
         for item in items:
             published_date = self._parse_date(item.get('date_published'))
@@ -86,62 +102,21 @@ class RSSFeedScraper:
 
 class RSSFeedSentimentAnalyzer(BaseSentimentAnalyzer):
     """Analyzes sentiment from RSS feed content"""
-    def __init__(self, feed_url: str = config.api_config.reddit_rss_feed_url):
+    def __init__(self, feed_url: str = config.api_config.reddit_rss_feed_url,
+                 sia: Optional[SentimentIntensityAnalyzer] = None,
+                 sampler: Optional[AdaptiveSampler] = None,
+                 entities: Optional[EntityIndex] = None):
         self.scraper = RSSFeedScraper(feed_url)
-        self.sia = SentimentIntensityAnalyzer()
+        self.sia = sia or create_sentiment_analyzer()
+        self.sampler = sampler or default_sampler()
+        self.entities = entities or load_entity_index()
     
     def get_sentiment(self) -> SentimentResult:
         """Get sentiment analysis from RSS feed items"""
         try:
             # Fetch RSS items
             items = self.scraper.fetch_feed()
-            
-            if not items:
-                return SentimentResult(
-                    value=0.0,
-                    classification="Neutral",
-                    interpretation="No RSS items found",
-                    raw_data={"items_analyzed": 0},
-                    timestamp=datetime.now().isoformat()
-                )
-            
-            # Calculate sentiment for each item
-            sentiments = []
-            for item in items:
-                # Analyze both title and content
-                title_scores = self.sia.polarity_scores(item.title)
-                content_scores = self.sia.polarity_scores(item.content_text)
-                
-                # Average the compound scores (giving more weight to title)
-                item_sentiment = (title_scores['compound'] * 0.6 + 
-                                content_scores['compound'] * 0.4)
-                sentiments.append(item_sentiment)
-            
-            # Calculate average sentiment
-            avg_sentiment = sum(sentiments) / len(sentiments)
-            
-            # Get classification based on sentiment score
-            classification = self.classify_sentiment(avg_sentiment)
-            
-            # Create interpretation
-            interpretation = f"{classification} - RSS feed sentiment is "
-            if avg_sentiment > 0:
-                interpretation += "positive, showing optimistic market signals"
-            elif avg_sentiment < 0:
-                interpretation += "negative, showing pessimistic market signals"
-            else:
-                interpretation += "neutral, showing balanced market signals"
-            
-            return SentimentResult(
-                value=avg_sentiment,
-                classification=classification,
-                interpretation=interpretation,
-                raw_data={
-                    "items_analyzed": len(items),
-                    "latest_item_date": items[0].published_date.isoformat() if items[0].published_date else None
-                },
-                timestamp=datetime.now().isoformat()
-            )
+            return self.analyze_items(items)
             
         except RSSFeedError as e:
             return SentimentResult(
@@ -151,4 +126,68 @@ class RSSFeedSentimentAnalyzer(BaseSentimentAnalyzer):
                 raw_data={"error": str(e)},
                 timestamp=datetime.now().isoformat()
             )
-            
\ No newline at end of file
+
+    def analyze_items(self, items: List[RSSItem], timestamp: Optional[str] = None) -> SentimentResult:
+        """Score already-parsed RSS items without touching the network"""
+        timestamp = timestamp or datetime.now().isoformat()
+        if not items:
+            return SentimentResult(
+                value=0.0,
+                classification="Neutral",
+                interpretation="No RSS items found",
+                raw_data={"items_analyzed": 0},
+                timestamp=timestamp
+            )
+        
+        # Calculate sentiment for each item, a page at a time when sampling
+        # adaptively so scoring stops once the mean has converged, and credit
+        # it to every asset the item mentions
+        max_items = min(self.sampler.max_items or len(items), len(items)) if self.sampler else len(items)
+        page_size = self.sampler.page_size if self.sampler else len(items)
+        sentiments = []
+        tags = []
+        for item in items[:max_items]:
+            # Analyze both title and content
+            title_scores = self.sia.polarity_scores(item.title)
+            content_scores = self.sia.polarity_scores(item.content_text)
+            
+            # Average the compound scores (giving more weight to title)
+            item_sentiment = (title_scores['compound'] * 0.6 + 
+                            content_scores['compound'] * 0.4)
+            sentiments.append(item_sentiment)
+            tags.append(self.entities.tag(item.title, item.content_text))
+            
+            if (self.sampler and len(sentiments) % page_size == 0
+                    and self.sampler.is_done(np.array(sentiments), len(sentiments))):
+                break
+        
+        # Calculate average sentiment
+        avg_sentiment = sum(sentiments) / len(sentiments)
+        
+        # Get classification based on sentiment score
+        classification = self.classify_sentiment(avg_sentiment)
+        
+        # Create interpretation
+        interpretation = f"{classification} - RSS feed sentiment is "
+        if avg_sentiment > 0:
+            interpretation += "positive, showing optimistic market signals"
+        elif avg_sentiment < 0:
+            interpretation += "negative, showing pessimistic market signals"
+        else:
+            interpretation += "neutral, showing balanced market signals"
+        
+        raw_data = {
+            "items_analyzed": len(sentiments),
+            "latest_item_date": items[0].published_date.isoformat() if items[0].published_date else None,
+            "assets": asset_summary(tags, sentiments)
+        }
+        if self.sampler:
+            raw_data["sampling"] = self.sampler.report(np.array(sentiments), len(sentiments), len(items))
+        
+        return SentimentResult(
+            value=avg_sentiment,
+            classification=classification,
+            interpretation=interpretation,
+            raw_data=raw_data,
+            timestamp=timestamp
+        )
@@ -0,0 +1,99 @@
+"""Shared text scoring helpers for the sentiment analyzers"""
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from nltk.sentiment import SentimentIntensityAnalyzer
+from src.config import SentimentConfig, config
+from src.sentiment.lexicon import create_sentiment_analyzer
+
+class CachedSentimentScorer:
+    """Memoizes polarity scores so repeated texts are only scored once
+
+    Exposes the same ``polarity_scores`` method as
+    ``SentimentIntensityAnalyzer`` so it can be passed to any analyzer.
+    """
+    def __init__(self, sia: Optional[SentimentIntensityAnalyzer] = None):
+        self.sia = sia or create_sentiment_analyzer()
+        self.cache: Dict[str, Dict[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        """Return cached scores for text, scoring it on first sight"""
+        scores = self.cache.get(text)
+        if scores is None:
+            self.misses += 1
+            scores = self.sia.polarity_scores(text)
+            self.cache[text] = scores
+        else:
+            self.hits += 1
+        return scores
+
+class AdaptiveSampler:
+    """Decides when enough items have been scored to trust the mean
+
+    Items are fetched and scored a page at a time. After each page the
+    mean of the per-item scores and its normal-approximation confidence
+    interval are recomputed; sampling stops once the interval half-width
+    drops below the tolerance or the item cap (if any) is reached.
+    """
+    def __init__(self,
+                 page_size: int = 25,
+                 tolerance: float = 0.05,
+                 z: float = 1.96,
+                 min_items: int = 20,
+                 max_items: Optional[int] = None):
+        self.page_size = page_size
+        self.tolerance = tolerance
+        self.z = z
+        self.min_items = min_items
+        self.max_items = max_items
+
+    @classmethod
+    def from_config(cls, sentiment: SentimentConfig, max_items: Optional[int] = None) -> 'AdaptiveSampler':
+        """Build a sampler from the sentiment configuration"""
+        return cls(
+            page_size=sentiment.sampling_page_size,
+            tolerance=sentiment.sampling_tolerance,
+            z=sentiment.sampling_confidence_z,
+            min_items=sentiment.sampling_min_items,
+            max_items=max_items
+        )
+
+    def interval(self, values: np.ndarray) -> Tuple[float, float, int]:
+        """Mean, confidence interval half-width and count, ignoring NaN"""
+        values = values[~np.isnan(values)]
+        count = len(values)
+        if count == 0:
+            return float('nan'), float('inf'), 0
+        if count == 1:
+            return float(values[0]), float('inf'), 1
+        half_width = self.z * float(values.std(ddof=1)) / np.sqrt(count)
+        return float(values.mean()), float(half_width), count
+
+    def is_done(self, values: np.ndarray, scored: int) -> bool:
+        """Whether sampling can stop after ``scored`` items"""
+        if self.max_items is not None and scored >= self.max_items:
+            return True
+        _, half_width, count = self.interval(values)
+        return count >= self.min_items and half_width <= self.tolerance
+
+    def report(self, values: np.ndarray, scored: int, available: Optional[int] = None) -> Dict[str, Any]:
+        """Summary of the achieved interval for ``raw_data``"""
+        mean, half_width, count = self.interval(values)
+        return {
+            'items_scored': scored,
+            'items_available': available,
+            'mean': mean,
+            'ci_half_width': half_width,
+            'ci_low': mean - half_width,
+            'ci_high': mean + half_width,
+            'confidence_z': self.z,
+            'tolerance': self.tolerance,
+            'converged': count >= self.min_items and half_width <= self.tolerance
+        }
+
+def default_sampler(max_items: Optional[int] = None) -> Optional[AdaptiveSampler]:
+    """Configured sampler when adaptive sampling is enabled, else None"""
+    if not config.sentiment.adaptive_sampling:
+        return None
+    return AdaptiveSampler.from_config(config.sentiment, max_items=max_items)
@@ -0,0 +1,201 @@
+"""Vectorized calibration of source weights against later price moves"""
+import json
+import os
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+import numpy as np
+from src.config import WEIGHT_FIELDS, SentimentConfig, config
+from src.services.replay import ReplayEngine, ReplayResult
+from src.services.snapshot_archive import SnapshotArchive
+from src.utils.errors.exceptions import DataProcessingError
+
+# Forward horizon in seconds for each PriceData change field
+TARGET_HORIZONS = {
+    'change_1h': 3600,
+    'change_24h': 24 * 3600,
+}
+
+METRICS = ('correlation', 'hit_rate')
+
+@dataclass
+class CalibrationData:
+    """Per-source scores and prices of a history, one row per run"""
+    timestamps: np.ndarray  # Unix seconds, shape (n,)
+    scores: np.ndarray  # Source scores in WEIGHT_FIELDS order, shape (n, 4)
+    prices: np.ndarray  # Bitcoin price at each run, NaN when missing, shape (n,)
+
+@dataclass
+class CalibrationResult:
+    """Metrics for every evaluated weight vector"""
+    weights: np.ndarray  # shape (k, 4)
+    correlation: np.ndarray  # shape (k,)
+    hit_rate: np.ndarray  # shape (k,)
+    sample_count: int
+
+    def best(self, metric: str = 'correlation') -> int:
+        """Index of the candidate scoring highest on the given metric
+
+        Raises:
+            DataProcessingError: The metric is undefined for every candidate,
+                e.g. because no forward return is non-zero or all are equal
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+        values = getattr(self, metric)
+        if np.isnan(values).all():
+            raise DataProcessingError(
+                f"No candidate has a defined {metric}, the forward returns may all be zero or identical"
+            )
+        return int(np.nanargmax(values))
+
+def calibration_data_from_results(results: Iterable[ReplayResult]) -> CalibrationData:
+    """Collect the score matrix and prices from replayed runs"""
+    rows = []
+    for result in results:
+        combined = result.combined
+        price_data = combined.price_data
+        rows.append((
+            combined.timestamp.timestamp(),
+            combined.fear_greed_score.value,
+            combined.reddit_score,
+            combined.rss_1_score,
+            combined.rss_2_score,
+            price_data.current_price if price_data else np.nan
+        ))
+
+    if not rows:
+        raise DataProcessingError("No history available for calibration")
+
+    table = np.array(rows, dtype=float)
+    order = np.argsort(table[:, 0], kind='stable')
+    table = table[order]
+    return CalibrationData(timestamps=table[:, 0], scores=table[:, 1:5], prices=table[:, 5])
+
+def load_calibration_data(archive_dir: Optional[str] = None,
+                          start: Optional[datetime] = None,
+                          end: Optional[datetime] = None) -> CalibrationData:
+    """Replay the snapshot archive into a calibration dataset"""
+    archive = SnapshotArchive(archive_dir)
+    return calibration_data_from_results(ReplayEngine().replay(archive.iter_snapshots(start=start, end=end)))
+
+def forward_returns(timestamps: np.ndarray,
+                    prices: np.ndarray,
+                    horizon: float,
+                    tolerance: Optional[float] = None) -> np.ndarray:
+    """
+    Price return from each run to the first run at least ``horizon`` seconds later
+
+    Args:
+        timestamps: Sorted Unix timestamps of the runs
+        prices: Price at each run
+        horizon: Forward horizon in seconds
+        tolerance: Maximum overshoot past the horizon, defaults to half the horizon
+
+    Returns:
+        Array of forward returns, NaN where no later run is close enough
+    """
+    tolerance = horizon / 2 if tolerance is None else tolerance
+    targets = np.searchsorted(timestamps, timestamps + horizon, side='left')
+    valid = targets < len(timestamps)
+    clipped = np.minimum(targets, len(timestamps) - 1)
+    valid &= (timestamps[clipped] - timestamps) <= horizon + tolerance
+
+    returns = np.full(len(timestamps), np.nan)
+    returns[valid] = prices[clipped[valid]] / prices[valid] - 1
+    return returns
+
+def grid_weights(step: float = 0.05) -> np.ndarray:
+    """All non-negative weight vectors summing to 1 on a regular grid"""
+    steps = int(round(1 / step))
+    axis = np.arange(steps + 1)
+    a, b, c = np.meshgrid(axis, axis, axis, indexing='ij')
+    d = steps - a - b - c
+    keep = d >= 0
+    return np.stack([a[keep], b[keep], c[keep], d[keep]], axis=1) / steps
+
+def random_weights(count: int, seed: Optional[int] = None) -> np.ndarray:
+    """Uniformly sampled non-negative weight vectors summing to 1"""
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.ones(len(WEIGHT_FIELDS)), size=count)
+
+def evaluate_weights(scores: np.ndarray,
+                     returns: np.ndarray,
+                     weights: np.ndarray,
+                     batch_size: Optional[int] = None) -> CalibrationResult:
+    """
+    Score every candidate weight vector in one vectorized pass
+
+    Correlation is computed from the source covariance matrix, so its cost
+    does not depend on the number of runs. Hit rate (share of runs where the
+    sign of the weighted score matches the sign of the return) needs the
+    full prediction matrix and is evaluated in batches to bound memory.
+
+    Args:
+        scores: Source score matrix, shape (n, 4)
+        returns: Forward returns, shape (n,)
+        weights: Candidate weight vectors, shape (k, 4)
+        batch_size: Candidates per hit-rate batch, sized to about 16M
+            predictions by default
+
+    Returns:
+        CalibrationResult with one metric value per candidate
+    """
+    usable = ~np.isnan(returns) & ~np.isnan(scores).any(axis=1)
+    scores = scores[usable]
+    returns = returns[usable]
+    if len(returns) < 2:
+        raise DataProcessingError("Not enough runs with forward returns to calibrate, runs may be further apart than the target horizon")
+
+    # corr(S w, r) = w . cov(S, r) / sqrt(w' cov(S) w * var(r))
+    centered_scores = scores - scores.mean(axis=0)
+    centered_returns = returns - returns.mean()
+    score_cov = centered_scores.T @ centered_scores
+    cross_cov = centered_scores.T @ centered_returns
+    prediction_var = np.einsum('ij,jk,ik->i', weights, score_cov, weights)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = (weights @ cross_cov) / np.sqrt(prediction_var * (centered_returns @ centered_returns))
+    if returns.min() == returns.max():
+        # Centering leaves rounding noise rather than exact zeros, so a
+        # constant return would otherwise get arbitrary correlations
+        correlation[:] = np.nan
+
+    # Flipping each run's scores by the sign of its return turns a sign
+    # match into a positive prediction
+    moved = returns != 0
+    signed_scores = (scores[moved] * np.sign(returns[moved])[:, None]).astype(np.float32)
+    moved_count = len(signed_scores)
+    hit_rate = np.full(len(weights), np.nan)
+    if moved_count:
+        batch_size = batch_size or max(1, (1 << 24) // moved_count)
+        for begin in range(0, len(weights), batch_size):
+            batch = weights[begin:begin + batch_size].astype(np.float32)
+            hits = np.count_nonzero(signed_scores @ batch.T > 0, axis=0)
+            hit_rate[begin:begin + batch_size] = hits / moved_count
+
+    return CalibrationResult(
+        weights=weights,
+        correlation=correlation,
+        hit_rate=hit_rate,
+        sample_count=int(len(returns))
+    )
+
+def weights_to_config(weights: np.ndarray, base: Optional[SentimentConfig] = None) -> SentimentConfig:
+    """Copy a weight vector onto a SentimentConfig"""
+    base = base or config.sentiment
+    return replace(base, **{field: float(value) for field, value in zip(WEIGHT_FIELDS, weights)})
+
+def save_sentiment_config(sentiment: SentimentConfig, path: Optional[str] = None) -> Path:
+    """Atomically write the weights of a SentimentConfig where Config picks them up
+    
+    Only WEIGHT_FIELDS are stored, so other settings keep following the
+    code defaults.
+    """
+    path = Path(path or config.storage.weights_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({field: getattr(sentiment, field) for field in WEIGHT_FIELDS}, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
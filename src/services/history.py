@@ -0,0 +1,79 @@
+"""Local JSON Lines history of combined sentiment results"""
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.config import config
+from src.models import CombinedSentiment
+from src.sentiment.base_analyzer import SentimentResult
+
+def build_history_record(combined: CombinedSentiment,
+                         source_results: Dict[str, SentimentResult]) -> Dict[str, Any]:
+    """Flatten a run's combined result and per-source results into one record"""
+    return {
+        **combined.to_dict(),
+        'sources': {
+            name: {
+                'value': result.value,
+                'classification': result.classification,
+                'interpretation': result.interpretation,
+                'timestamp': result.timestamp,
+                'stale': bool(result.raw_data and result.raw_data.get('stale'))
+            }
+            for name, result in source_results.items()
+        }
+    }
+
+class SentimentHistory:
+    """Append-only history file, one JSON record per run"""
+
+    def __init__(self, history_file: Optional[str] = None):
+        self.path = Path(history_file or config.storage.history_file)
+
+    def append(self, record: Dict[str, Any]):
+        """Append one record"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def read_tail(self, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Last ``limit`` records and the file offset reading stopped at"""
+        if not self.path.exists():
+            return [], 0
+        with open(self.path, 'rb') as f:
+            lines = deque(f, maxlen=limit)
+            offset = f.tell()
+        if lines and not lines[-1].endswith(b'\n'):
+            offset -= len(lines.pop())
+        return self._decode(lines), offset
+
+    def read_from(self, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Complete records written after ``offset`` and the new offset"""
+        if not self.path.exists():
+            return [], offset
+        if self.path.stat().st_size < offset:
+            # The file was truncated or replaced, start over
+            offset = 0
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        # Leave a partially written last line for the next read
+        complete = data[:data.rfind(b'\n') + 1]
+        return self._decode(complete.splitlines()), offset + len(complete)
+
+    def _decode(self, lines: Iterable[bytes]) -> List[Dict[str, Any]]:
+        """Decode complete lines, skipping any that are not a JSON object"""
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                print(f"Warning: Skipping malformed line in {self.path}: {e}")
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+            else:
+                print(f"Warning: Skipping non-object line in {self.path}")
+        return records
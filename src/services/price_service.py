@@ -1,7 +1,8 @@
 """Service for fetching cryptocurrency price data"""
 from datetime import datetime
-import requests
+from typing import Dict, Optional
 from src.utils.errors.exceptions import DataFetchError
+from src.utils.http.hedging import hedged_get
 # TODO: Restructure foldering
 from src.models import PriceData
 from src.config import config
@@ -11,35 +12,60 @@ class CryptoPriceService:
     
     def __init__(self, api_url: str = None):
         self.api_url = api_url or config.api_config.bitcoin_price_api_url
+        self.last_payload: Optional[dict] = None
     
     def get_bitcoin_price(self) -> PriceData:
         """Fetch current Bitcoin price and related metrics"""
         try:
-            response = requests.get(self.api_url)
+            self.last_payload = None
+            response = hedged_get(self.api_url, hedge_after=config.source_cache.hedge_after,
+                                  timeout=config.source_cache.request_timeout)
             response.raise_for_status()
-            data = response.json()
+            self.last_payload = response.json()
             
-            btc_data = data['data']['1']  # 1 is the ID for Bitcoin
-            current_price = float(btc_data['quotes']['USD']['price'])
-            
-            # Calculate price changes
-            change_1h = float(btc_data['quotes']['USD']['percentage_change_1h']) / 100
-            change_24h = float(btc_data['quotes']['USD']['percentage_change_24h']) / 100
-            
-            price_1h = current_price / (1 + change_1h)
-            price_24h = current_price / (1 + change_24h)
-            
-            return PriceData(
-                current_price=current_price,
-                price_1h=price_1h,
-                price_24h=price_24h,
-                change_1h=change_1h,
-                change_24h=change_24h,
-                timestamp=datetime.now()
-            )
+            return self.parse_bitcoin_price(self.last_payload)
             
         except Exception as e:
             raise DataFetchError(f"Failed to fetch Bitcoin price data: {str(e)}")
+    
+    def parse_bitcoin_price(self, data: dict, timestamp: Optional[datetime] = None) -> PriceData:
+        """Extract Bitcoin price metrics from a raw ticker response"""
+        btc_data = data['data']['1']  # 1 is the ID for Bitcoin
+        return self._parse_quote(btc_data, timestamp)
+    
+    def parse_asset_prices(self, data: Optional[dict], timestamp: Optional[datetime] = None) -> Dict[str, PriceData]:
+        """Price metrics of every asset in a raw ticker response, keyed by symbol
+        
+        The ticker endpoint returns the top assets in the same response used
+        for Bitcoin, so this needs no extra request. Malformed entries are skipped.
+        """
+        prices = {}
+        for asset_data in ((data or {}).get('data') or {}).values():
+            try:
+                prices[asset_data['symbol'].upper()] = self._parse_quote(asset_data, timestamp)
+            except (KeyError, TypeError, ValueError, ZeroDivisionError):
+                continue
+        return prices
+    
+    def _parse_quote(self, asset_data: dict, timestamp: Optional[datetime] = None) -> PriceData:
+        """Build price metrics from one ticker entry's USD quote"""
+        current_price = float(asset_data['quotes']['USD']['price'])
+        
+        # Calculate price changes
+        change_1h = float(asset_data['quotes']['USD']['percentage_change_1h']) / 100
+        change_24h = float(asset_data['quotes']['USD']['percentage_change_24h']) / 100
+        
+        price_1h = current_price / (1 + change_1h)
+        price_24h = current_price / (1 + change_24h)
+        
+        return PriceData(
+            current_price=current_price,
+            price_1h=price_1h,
+            price_24h=price_24h,
+            change_1h=change_1h,
+            change_24h=change_24h,
+            timestamp=timestamp or datetime.now()
+        )
 
 # Global service instance
 price_service = CryptoPriceService()
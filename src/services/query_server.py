@@ -0,0 +1,254 @@
+"""Local HTTP/JSON query service over recent sentiment results"""
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from src.config import QueryServerConfig, config
+from src.services.history import SentimentHistory
+
+# Numeric series that can be aggregated, keyed by query name
+AGGREGATE_FIELDS = {
+    'final_score': lambda record: record['final_score'],
+    'fear_greed_score': lambda record: record['fear_greed_score'],
+    'reddit_score': lambda record: record['reddit_score'],
+    'rss_1_score': lambda record: record['rss_1_score'],
+    'rss_2_score': lambda record: record['rss_2_score'],
+    'price': lambda record: record['price']['current_price'] if record.get('price') else None,
+}
+
+# Trailing UTC offset whose '+' was decoded to a space by parse_qs
+_DECODED_PLUS_OFFSET = re.compile(r' (\d{2}:?\d{2})$')
+
+# Cap on cached responses per buffer state, so arbitrary ranges from many
+# clients cannot grow memory between appends
+MAX_CACHED_RESPONSES = 1024
+
+def _serialize(value: Any) -> bytes:
+    """Compact JSON encoding used for every response body"""
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+def _buffer_entry(record: Dict[str, Any]) -> Tuple[float, bytes, Tuple[float, ...]]:
+    """Timestamp, serialized bytes and aggregate values of one record"""
+    return (
+        datetime.fromisoformat(record['timestamp']).timestamp(),
+        _serialize(record),
+        tuple(_nan_if_none(get(record)) for get in AGGREGATE_FIELDS.values())
+    )
+
+class _BufferState:
+    """Immutable view of the buffer, swapped atomically on every append"""
+
+    def __init__(self, entries: Iterable[Tuple[float, bytes, Tuple[float, ...]]]):
+        entries = list(entries)
+        self.timestamps = [timestamp for timestamp, _, _ in entries]
+        self.payloads = [payload for _, payload, _ in entries]
+        self.latest = self.payloads[-1] if self.payloads else b'null'
+        columns = np.array([values for _, _, values in entries], dtype=float).reshape(
+            len(entries), len(AGGREGATE_FIELDS)
+        ).T.copy()
+        self.series = dict(zip(AGGREGATE_FIELDS, columns))
+        self.responses: Dict[Tuple, bytes] = {}
+
+    def remember(self, key: Tuple, body: bytes):
+        """Cache a response body for this state, starting over when full"""
+        if len(self.responses) >= MAX_CACHED_RESPONSES:
+            self.responses.clear()
+        self.responses[key] = body
+
+class SentimentRingBuffer:
+    """Fixed-size buffer of recent runs with pre-serialized responses
+
+    Every record is serialized once when it arrives and kept alongside its
+    timestamp and aggregate values. Readers grab the current immutable
+    state without locking, so range queries only join ready-made bytes and
+    repeated aggregate queries are served from a per-state response cache.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._entries = deque(maxlen=capacity)
+        self._write_lock = threading.Lock()
+        self._state = _BufferState([])
+
+    def __len__(self) -> int:
+        return len(self._state.payloads)
+
+    def extend(self, records: Iterable[Dict[str, Any]]):
+        """Add records in time order, evicting the oldest beyond capacity"""
+        entries = []
+        for record in records:
+            try:
+                entries.append(_buffer_entry(record))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Warning: Skipping unusable history record: {e!r}")
+        with self._write_lock:
+            # Build the new state first, so a failure leaves the buffer as it was
+            state = _BufferState([*self._entries, *entries][-self._entries.maxlen:])
+            self._entries.extend(entries)
+            self._state = state
+
+    def latest(self) -> bytes:
+        """Most recent record"""
+        return self._state.latest
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None) -> bytes:
+        """Records with start <= timestamp < end"""
+        state = self._state
+        key = ('range', start, end)
+        cached = state.responses.get(key)
+        if cached is None:
+            lo = bisect_left(state.timestamps, start) if start is not None else 0
+            hi = bisect_left(state.timestamps, end) if end is not None else len(state.timestamps)
+            cached = b'[' + b','.join(state.payloads[lo:hi]) + b']'
+            state.remember(key, cached)
+        return cached
+
+    def aggregate(self, field: str, start: Optional[float] = None, end: Optional[float] = None) -> bytes:
+        """Summary statistics of one series with start <= timestamp < end"""
+        if field not in AGGREGATE_FIELDS:
+            raise ValueError(f"Unknown field '{field}', expected one of {sorted(AGGREGATE_FIELDS)}")
+
+        state = self._state
+        key = ('aggregate', field, start, end)
+        cached = state.responses.get(key)
+        if cached is None:
+            lo = bisect_left(state.timestamps, start) if start is not None else 0
+            hi = bisect_left(state.timestamps, end) if end is not None else len(state.timestamps)
+            values = state.series[field][lo:hi]
+            values = values[~np.isnan(values)]
+            summary = {'field': field, 'count': int(len(values))}
+            if len(values):
+                summary.update({
+                    'mean': float(values.mean()),
+                    'min': float(values.min()),
+                    'max': float(values.max()),
+                    'std': float(values.std()),
+                    'first': float(values[0]),
+                    'last': float(values[-1])
+                })
+            cached = _serialize(summary)
+            state.remember(key, cached)
+        return cached
+
+def _nan_if_none(value: Optional[float]) -> float:
+    """Map missing values to NaN so series stay numeric
+
+    Raises:
+        TypeError, ValueError: The value is not numeric
+    """
+    return float('nan') if value is None else float(value)
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    """Parse a query time given as Unix seconds or an ISO timestamp
+
+    Timestamps copied from records into a URL usually leave the ``+`` of
+    the UTC offset unencoded, which query parsing turns into a space, so a
+    space before a trailing offset is read as ``+``. A ``Z`` suffix means UTC.
+    """
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        value = _DECODED_PLUS_OFFSET.sub(r'+\1', value.strip())
+        if value.endswith(('Z', 'z')):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value).timestamp()
+
+def _time_bounds(params: Dict[str, str]) -> Tuple[Optional[float], Optional[float]]:
+    """Start and end from ``start``/``end`` or a trailing ``window`` in seconds"""
+    if 'window' in params:
+        # Round to the second so repeated polls share a cached response
+        end = float(int(time.time()) + 1)
+        return end - float(params['window']), end
+    return _parse_time(params.get('start')), _parse_time(params.get('end'))
+
+def make_handler(buffer: SentimentRingBuffer):
+    """Request handler class bound to a buffer"""
+
+    class QueryHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive for clients that poll
+        disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                if url.path == '/latest':
+                    body = buffer.latest()
+                elif url.path == '/range':
+                    body = buffer.range(*_time_bounds(params))
+                elif url.path == '/aggregate':
+                    body = buffer.aggregate(params.get('field', 'final_score'), *_time_bounds(params))
+                elif url.path == '/health':
+                    body = _serialize({'status': 'ok', 'records': len(buffer)})
+                else:
+                    self._send(404, _serialize({'error': f"Unknown path '{url.path}'"}))
+                    return
+            except ValueError as e:
+                self._send(400, _serialize({'error': str(e)}))
+                return
+            self._send(200, body)
+
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            """Skip per-request logging to keep the hot path cheap"""
+            pass
+
+    return QueryHandler
+
+class SentimentQueryServer:
+    """Serves the ring buffer over HTTP and keeps it in sync with local history"""
+
+    def __init__(self,
+                 settings: Optional[QueryServerConfig] = None,
+                 history: Optional[SentimentHistory] = None):
+        self.settings = settings or config.query_server
+        self.history = history or SentimentHistory()
+        self.buffer = SentimentRingBuffer(self.settings.buffer_size)
+        self._offset = 0
+        self._stopped = threading.Event()
+        self.httpd = ThreadingHTTPServer((self.settings.host, self.settings.port), make_handler(self.buffer))
+        self.httpd.daemon_threads = True
+
+    def load_history(self):
+        """Fill the buffer with the most recent runs on disk"""
+        records, self._offset = self.history.read_tail(self.settings.buffer_size)
+        self.buffer.extend(records)
+
+    def _follow_history(self):
+        """Pick up runs appended to the history file while serving"""
+        while not self._stopped.wait(self.settings.poll_interval):
+            try:
+                records, self._offset = self.history.read_from(self._offset)
+                if records:
+                    self.buffer.extend(records)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Failed to read sentiment history: {e}")
+
+    def serve_forever(self):
+        """Load history, then serve until shutdown is called"""
+        self.load_history()
+        threading.Thread(target=self._follow_history, name='history-follower', daemon=True).start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self._stopped.set()
+            self.httpd.server_close()
+
+    def shutdown(self):
+        """Stop serving"""
+        self._stopped.set()
+        self.httpd.shutdown()
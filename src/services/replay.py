@@ -0,0 +1,105 @@
+"""Offline replay of archived snapshots through the sentiment pipeline"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from src.config import SentimentConfig, config
+from src.models import CombinedSentiment, PriceData
+from src.sentiment.base_analyzer import SentimentResult
+from src.sentiment.combiner import build_fear_greed_score, build_reddit_score, combine_asset_sentiment, combine_sentiment
+from src.sentiment.fear_greed_index import CNNFearGreedFetcher
+from src.sentiment.reddit_analyzer import RedditSentimentAnalyzer
+from src.sentiment.rss_feed import RSSFeedSentimentAnalyzer
+from src.sentiment.scoring import CachedSentimentScorer
+from src.services.price_service import CryptoPriceService
+from src.utils.errors.exceptions import DataProcessingError
+
+@dataclass
+class ReplayResult:
+    """Pipeline output rebuilt from one archived snapshot"""
+    combined: CombinedSentiment
+    fear_greed: SentimentResult
+    reddit: SentimentResult
+    rss: Dict[str, SentimentResult]
+
+class ReplayEngine:
+    """Pushes archived snapshots through parsing, scoring and weighting
+
+    Text scores are memoized across snapshots, so feed items and posts that
+    show up in many consecutive runs are only scored once per replay.
+    """
+
+    def __init__(self,
+                 weights: Optional[SentimentConfig] = None,
+                 scorer: Optional[CachedSentimentScorer] = None,
+                 feed_names: Optional[List[str]] = None):
+        self.weights = weights or config.sentiment
+        self.scorer = scorer or CachedSentimentScorer()
+        self.feed_names = feed_names or list(config.api_config.rss_feeds)
+        self.fear_greed_fetcher = CNNFearGreedFetcher()
+        self.reddit_analyzer = RedditSentimentAnalyzer(sia=self.scorer)
+        self.rss_analyzer = RSSFeedSentimentAnalyzer(sia=self.scorer)
+        self.price_service = CryptoPriceService()
+        self.skipped = 0
+
+    def replay_snapshot(self, snapshot: Dict[str, Any]) -> ReplayResult:
+        """Rebuild the combined sentiment for a single snapshot"""
+        # Sources served from the fallback cache were archived as results
+        stale = {name: SentimentResult(**result) for name, result in snapshot.get('stale', {}).items()}
+        if not snapshot.get('fear_greed') and 'fear_greed' not in stale:
+            raise DataProcessingError(f"Snapshot {snapshot.get('timestamp')} has no Fear & Greed data")
+
+        run_time = datetime.fromisoformat(snapshot['timestamp'])
+        result_timestamp = run_time.replace(tzinfo=None).isoformat()
+
+        fear_greed_result = stale.get('fear_greed') or self.fear_greed_fetcher.parse_payload(snapshot['fear_greed'])
+        reddit_result = stale.get('reddit') or self.reddit_analyzer.analyze_posts(
+            snapshot.get('reddit') or [], timestamp=result_timestamp
+        )
+        rss_results = {
+            name: stale.get(name) or self.rss_analyzer.analyze_items(
+                self.rss_analyzer.scraper.parse_items(snapshot.get('rss', {}).get(name, [])),
+                timestamp=result_timestamp
+            )
+            for name in self.feed_names
+        }
+        price_data = self._parse_price(snapshot, run_time)
+        asset_prices = self.price_service.parse_asset_prices(snapshot.get('price'), timestamp=run_time.replace(tzinfo=None))
+
+        rss_1_score, rss_2_score = (rss_results[name] for name in self.feed_names[:2])
+        combined = combine_sentiment(
+            fear_greed_score=build_fear_greed_score(fear_greed_result),
+            reddit_score=build_reddit_score(reddit_result),
+            rss_1_score=rss_1_score,
+            rss_2_score=rss_2_score,
+            price_data=price_data,
+            weights=self.weights,
+            timestamp=run_time,
+            assets=combine_asset_sentiment(
+                {'reddit': reddit_result, **rss_results}, asset_prices
+            )
+        )
+        return ReplayResult(
+            combined=combined,
+            fear_greed=fear_greed_result,
+            reddit=reddit_result,
+            rss=rss_results
+        )
+
+    def _parse_price(self, snapshot: Dict[str, Any], run_time: datetime) -> Optional[PriceData]:
+        """Bitcoin price of a snapshot, or None like a live run whose ticker could not be parsed"""
+        if not snapshot.get('price'):
+            return None
+        try:
+            return self.price_service.parse_bitcoin_price(snapshot['price'], timestamp=run_time.replace(tzinfo=None))
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            print(f"Warning: Unusable price data in snapshot {snapshot.get('timestamp')}: {e!r}")
+            return None
+
+    def replay(self, snapshots: Iterable[Dict[str, Any]]) -> Iterator[ReplayResult]:
+        """Replay snapshots in order, skipping any that cannot be rebuilt"""
+        for snapshot in snapshots:
+            try:
+                yield self.replay_snapshot(snapshot)
+            except (DataProcessingError, KeyError, ValueError, TypeError) as e:
+                self.skipped += 1
+                print(f"Warning: Skipping snapshot {snapshot.get('timestamp')}: {e}")
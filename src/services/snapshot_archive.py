@@ -0,0 +1,127 @@
+"""Compressed archive of the raw inputs behind each sentiment run"""
+import gzip
+import json
+import os
+import zlib
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from src.config import config
+from src.sentiment.base_analyzer import SentimentResult
+
+ARCHIVE_VERSION = 1
+
+# content_html duplicates content_text and is never scored, so it is not kept
+ARCHIVED_RSS_FIELDS = ('id', 'url', 'title', 'content_text', 'image',
+                       'date_published', 'authors', 'attachments')
+
+def build_snapshot(timestamp: datetime,
+                   fear_greed_payload: Optional[dict],
+                   reddit_posts: List[Dict[str, Any]],
+                   rss_items: Dict[str, List[dict]],
+                   price_payload: Optional[dict],
+                   stale_results: Optional[Dict[str, SentimentResult]] = None) -> Dict[str, Any]:
+    """
+    Bundle the raw inputs of one run into an archivable snapshot
+
+    Args:
+        timestamp: When the run happened
+        fear_greed_payload: Raw Fear & Greed API response
+        reddit_posts: Raw posts as returned by RedditSentimentAnalyzer.fetch_posts
+        rss_items: Raw feed items keyed by feed name
+        price_payload: Raw ticker API response
+        stale_results: Cached results served instead of a live fetch, keyed
+            by source name; replay uses these as-is
+
+    Returns:
+        JSON-serializable snapshot dict
+    """
+    return {
+        'version': ARCHIVE_VERSION,
+        'timestamp': timestamp.isoformat(),
+        'fear_greed': fear_greed_payload,
+        'reddit': reddit_posts,
+        'rss': {
+            name: [{field: item[field] for field in ARCHIVED_RSS_FIELDS if field in item} for item in items]
+            for name, items in rss_items.items()
+        },
+        'price': price_payload,
+        'stale': {name: asdict(result) for name, result in (stale_results or {}).items()}
+    }
+
+class SnapshotArchive:
+    """Stores each snapshot as its own gzip-compressed JSON file
+
+    Snapshots live in one directory per month, named by timestamp so a
+    sorted listing is in time order. Each file is written to a temporary
+    name and renamed into place, so an append costs the same however full
+    the month is and a run killed mid-write never leaves a partial
+    snapshot behind. Monthly ``snapshots-YYYY-MM.jsonl.gz`` files from
+    earlier versions are still read.
+    """
+
+    def __init__(self, archive_dir: Optional[str] = None):
+        self.archive_dir = Path(archive_dir or config.storage.archive_dir)
+
+    def _path_for(self, timestamp: datetime) -> Path:
+        """File holding the snapshot taken at the given time"""
+        return self.archive_dir / f"snapshots-{timestamp:%Y-%m}" / f"snapshot-{timestamp:%Y%m%dT%H%M%S%f}.json.gz"
+
+    def append(self, snapshot: Dict[str, Any]) -> Path:
+        """Write one snapshot, returning the file it was written to"""
+        path = self._path_for(datetime.fromisoformat(snapshot['timestamp']))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(snapshot, separators=(',', ':'), default=str).encode('utf-8')
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return path
+
+    def iter_snapshots(self,
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield archived snapshots in time order, optionally within [start, end)
+
+        Damaged files are skipped with a warning, so one bad snapshot does
+        not stop a replay.
+        """
+        for snapshot in self._read_all():
+            if start or end:
+                timestamp = datetime.fromisoformat(snapshot['timestamp'])
+                if start and timestamp < start:
+                    continue
+                if end and timestamp >= end:
+                    continue
+            yield snapshot
+
+    def _read_all(self) -> Iterator[Dict[str, Any]]:
+        """Every readable snapshot, month by month"""
+        # A legacy monthly file predates that month's directory, so read it first
+        months = sorted(self.archive_dir.glob('snapshots-*'), key=lambda path: (path.name[:17], path.is_dir()))
+        for month in months:
+            if month.is_dir():
+                for path in sorted(month.glob('snapshot-*.json.gz')):
+                    try:
+                        yield json.loads(gzip.decompress(path.read_bytes()))
+                    except (EOFError, OSError, ValueError, zlib.error) as e:
+                        print(f"Warning: Skipping damaged snapshot {path}: {e}")
+            elif month.name.endswith('.jsonl.gz'):
+                try:
+                    yield from self._read_legacy_file(month)
+                except (EOFError, OSError, zlib.error, UnicodeDecodeError) as e:
+                    print(f"Warning: Skipping the rest of damaged archive {month}: {e}")
+
+    def _read_legacy_file(self, path: Path) -> Iterator[Dict[str, Any]]:
+        """Snapshots in a monthly JSON Lines file, skipping invalid lines"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    print(f"Warning: Skipping malformed snapshot in {path}: {e}")
@@ -0,0 +1,141 @@
+"""Last-known-good fallback cache for sentiment sources"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from src.config import SourceCacheConfig, config
+from src.sentiment.base_analyzer import SentimentResult
+
+class SourceCache:
+    """Stale-while-revalidate cache of the last good result per source
+
+    Each fetch gets a latency budget. When it fails or misses the budget,
+    the last good result is served (marked stale in ``raw_data``) as long
+    as it is younger than the source's max age, and the fetch keeps running
+    in the background so its result refreshes the cache for the next run.
+    Without a usable cached value the fetch outcome is returned as-is.
+    """
+
+    def __init__(self,
+                 cache_file: Optional[str] = None,
+                 settings: Optional[SourceCacheConfig] = None):
+        self.cache_file = Path(cache_file or config.storage.source_cache_file)
+        self.settings = settings or config.source_cache
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = self._load()
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='source-revalidate')
+
+    def _load(self) -> Dict[str, dict]:
+        """Read cached entries from disk, starting empty if unreadable"""
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """Write cached entries to disk atomically"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_file.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._entries, f, default=str)
+        os.replace(tmp_path, self.cache_file)
+
+    def _max_age(self, source: str) -> float:
+        """Oldest cached result, in seconds, that may be served for a source"""
+        return (self.settings.max_age or {}).get(source, self.settings.default_max_age)
+
+    def store(self, source: str, result: SentimentResult):
+        """Remember a good result as the source's last known value"""
+        with self._lock:
+            self._entries[source] = {'cached_at': time.time(), 'result': asdict(result)}
+            try:
+                self._save()
+            except OSError as e:
+                print(f"Warning: Failed to persist source cache: {e}")
+
+    def get_stale(self, source: str, reason: str) -> Optional[SentimentResult]:
+        """Cached result marked as stale, or None when missing or too old"""
+        with self._lock:
+            entry = self._entries.get(source)
+        if entry is None:
+            return None
+
+        age = time.time() - entry['cached_at']
+        if age > self._max_age(source):
+            return None
+
+        result = SentimentResult(**entry['result'])
+        return replace(
+            result,
+            interpretation=f"{result.interpretation} (stale: {reason})",
+            raw_data={
+                **(result.raw_data or {}),
+                'stale': True,
+                'stale_age_seconds': age,
+                'stale_reason': reason
+            }
+        )
+
+    def _revalidate(self, source: str, future):
+        """Cache the outcome of a fetch that finished after it was abandoned"""
+        if future.exception() is None and not _is_error(future.result()):
+            self.store(source, future.result())
+
+    def get_sentiment(self,
+                      source: str,
+                      fetch: Callable[[], SentimentResult],
+                      latency_budget: Optional[float] = None) -> SentimentResult:
+        """
+        Fetch a source's sentiment, falling back to its last good result
+
+        Args:
+            source: Cache key of the source
+            fetch: Callable performing the live fetch
+            latency_budget: Seconds to wait before serving the cached value
+
+        Returns:
+            Fresh result, stale cached result, or the failed fetch outcome
+
+        Raises:
+            Whatever ``fetch`` raised, when no usable cached value exists
+        """
+        budget = self.settings.latency_budget if latency_budget is None else latency_budget
+        future = self._executor.submit(fetch)
+        try:
+            result = future.result(timeout=budget)
+        except FutureTimeoutError:
+            stale = self.get_stale(source, f"no response within {budget:g}s")
+            if stale is not None:
+                # Let the in-flight fetch finish in the background as the revalidation
+                future.add_done_callback(lambda done: self._revalidate(source, done))
+                return stale
+            result = future.result()
+        except Exception as e:
+            stale = self.get_stale(source, str(e))
+            if stale is None:
+                raise
+            self._executor.submit(fetch).add_done_callback(lambda done: self._revalidate(source, done))
+            return stale
+
+        if _is_error(result):
+            stale = self.get_stale(source, result.interpretation)
+            if stale is not None:
+                self._executor.submit(fetch).add_done_callback(lambda done: self._revalidate(source, done))
+                return stale
+            return result
+
+        self.store(source, result)
+        return result
+
+def _is_error(result: SentimentResult) -> bool:
+    """Whether an analyzer reported a failed fetch"""
+    return result.classification == "Error"
+
+def is_stale(result: SentimentResult) -> bool:
+    """Whether a result was served from the cache instead of a live fetch"""
+    return bool(result.raw_data and result.raw_data.get('stale'))
@@ -0,0 +1,44 @@
+"""HTTP helpers that bound tail latency with hedged duplicate requests"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+import requests
+
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='hedged-get')
+
+def hedged_get(url: str,
+               hedge_after: Optional[float] = None,
+               max_requests: int = 2,
+               timeout: Optional[float] = None,
+               **kwargs) -> requests.Response:
+    """
+    GET a URL, firing a duplicate request if the first one is slow
+
+    Args:
+        url: URL to fetch
+        hedge_after: Seconds to wait before sending another copy of the
+            request, or None to send a single plain request
+        max_requests: Maximum number of copies in flight
+        timeout: Per-request timeout passed to requests
+        **kwargs: Extra arguments passed to requests.get
+
+    Returns:
+        The first response to arrive
+    """
+    if hedge_after is None or max_requests <= 1:
+        return requests.get(url, timeout=timeout, **kwargs)
+
+    pending = {_executor.submit(requests.get, url, timeout=timeout, **kwargs)}
+    sent = 1
+    error = None
+    while pending:
+        can_hedge = sent < max_requests
+        done, pending = wait(pending, timeout=hedge_after if can_hedge else None, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+        # Hedge when the request is slow, or replace one that failed fast
+        if can_hedge and (not done or not pending):
+            pending.add(_executor.submit(requests.get, url, timeout=timeout, **kwargs))
+            sent += 1
+    raise error
@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.config import WEIGHT_FIELDS, SentimentConfig
+from src.services.calibration import (
+    evaluate_weights, forward_returns, grid_weights, random_weights, save_sentiment_config, weights_to_config
+)
+from src.utils.errors.exceptions import DataProcessingError
+
+HOUR = 3600.0
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(7)
+    scores = rng.uniform(-1, 1, size=(300, 4))
+    returns = scores @ np.array([0.4, 0.1, 0.3, 0.2]) * 0.02 + rng.normal(0, 0.01, size=300)
+    return scores, returns
+
+def test_forward_returns_uses_first_run_past_horizon():
+    timestamps = np.array([0, 1, 2, 3, 4.5, 9]) * HOUR
+    prices = np.array([100, 110, 120, 130, 140, 150], dtype=float)
+    returns = forward_returns(timestamps, prices, horizon=2 * HOUR)
+    # The run at 2h answers 0h and the run at 3h answers 1h; 2h overshoots to
+    # 4.5h, within the default 1h tolerance; 3h and 4.5h only reach 9h, too late
+    np.testing.assert_allclose(returns[:3], [120 / 100 - 1, 130 / 110 - 1, 140 / 120 - 1])
+    assert np.isnan(returns[3:]).all()
+
+def test_forward_returns_tolerance():
+    timestamps = np.array([0, 3]) * HOUR
+    prices = np.array([100.0, 105.0])
+    assert np.isnan(forward_returns(timestamps, prices, horizon=HOUR)).all()
+    assert forward_returns(timestamps, prices, horizon=HOUR, tolerance=2 * HOUR)[0] == pytest.approx(0.05)
+
+def test_grid_weights_sum_to_one():
+    weights = grid_weights(0.25)
+    assert weights.shape == (35, 4)
+    np.testing.assert_allclose(weights.sum(axis=1), 1)
+    assert (weights >= 0).all()
+    np.testing.assert_allclose(random_weights(50, seed=1).sum(axis=1), 1)
+
+def test_correlation_matches_corrcoef(history):
+    scores, returns = history
+    weights = random_weights(200, seed=3)
+    result = evaluate_weights(scores, returns, weights)
+    expected = [np.corrcoef(scores @ w, returns)[0, 1] for w in weights]
+    np.testing.assert_allclose(result.correlation, expected, atol=1e-12)
+
+@pytest.mark.parametrize('batch_size', [None, 1, 7])
+def test_hit_rate_matches_brute_force(history, batch_size):
+    scores, returns = history
+    returns = returns.copy()
+    returns[::10] = 0  # Runs without a move do not count
+    weights = random_weights(50, seed=4)
+    result = evaluate_weights(scores, returns, weights, batch_size=batch_size)
+    moved = returns != 0
+    expected = [np.mean(np.sign(scores[moved] @ w) == np.sign(returns[moved])) for w in weights]
+    np.testing.assert_allclose(result.hit_rate, expected)
+
+def test_runs_with_missing_data_are_ignored(history):
+    scores, returns = history
+    scores, returns = scores.copy(), returns.copy()
+    scores[0, 2] = np.nan
+    returns[1] = np.nan
+    result = evaluate_weights(scores, returns, grid_weights(0.5))
+    assert result.sample_count == len(returns) - 2
+    assert not np.isnan(result.correlation).any()
+
+def test_best_picks_highest_metric(history):
+    scores, returns = history
+    result = evaluate_weights(scores, returns, np.array([[0, 1, 0, 0], [0.4, 0.1, 0.3, 0.2]], dtype=float))
+    assert result.best('correlation') == 1
+    assert result.best('hit_rate') == 1
+    with pytest.raises(ValueError):
+        result.best('sharpe')
+
+@pytest.mark.parametrize('returns', [np.zeros(20), np.full(20, 0.01)])
+def test_best_raises_when_metric_undefined(returns):
+    scores = np.random.default_rng(0).uniform(-1, 1, size=(20, 4))
+    result = evaluate_weights(scores, returns, grid_weights(0.5))
+    metric = 'hit_rate' if not returns.any() else 'correlation'
+    with pytest.raises(DataProcessingError):
+        result.best(metric)
+
+def test_too_few_runs_raise():
+    with pytest.raises(DataProcessingError):
+        evaluate_weights(np.zeros((1, 4)), np.array([0.1]), grid_weights(0.5))
+
+def test_saved_config_holds_only_weights(tmp_path):
+    sentiment = weights_to_config(np.array([0.1, 0.2, 0.3, 0.4]), base=SentimentConfig())
+    path = save_sentiment_config(sentiment, str(tmp_path / 'weights.json'))
+    saved = json.loads(path.read_text())
+    assert saved == dict(zip(WEIGHT_FIELDS, [0.1, 0.2, 0.3, 0.4]))
+    assert not list(tmp_path.glob('*.tmp'))
@@ -0,0 +1,84 @@
+import math
+
+import pytest
+
+from src.models import PriceData
+from src.sentiment.base_analyzer import SentimentResult
+from src.sentiment.combiner import combine_asset_sentiment
+from src.sentiment.entities import ASSETS_PATH, EntityIndex, asset_summary, entity_tokens, load_entity_index, parse_assets_text
+
+def test_entity_tokens_keeps_tickers_in_mixed_case():
+    assert entity_tokens("BTC and Ethereum rally") == ['BTC', 'and', 'ethereum', 'rally']
+
+def test_entity_tokens_cashtags_always_tickers():
+    assert entity_tokens("buying $sol and $Link") == ['buying', 'SOL', 'and', 'LINK']
+    assert entity_tokens("$DOT AND $LINK PUMP") == ['DOT', 'and', 'LINK', 'pump']
+
+def test_entity_tokens_lowercases_shouted_text():
+    assert entity_tokens("CONNECT THE DOT: A TON OF LINK") == ['connect', 'the', 'dot', 'a', 'ton', 'of', 'link']
+
+def test_parse_assets_text():
+    text = "# comment\nbtc\tbitcoin, xbt\n\nETH\t\n"
+    assert parse_assets_text(text) == {'BTC': ['bitcoin', 'xbt'], 'ETH': []}
+
+@pytest.mark.parametrize('text, expected', [
+    ("CONNECT THE DOT: A TON OF LINK", ()),
+    ("$DOT AND $LINK PUMP", ('DOT', 'LINK')),
+    ("BTC AND ETH RALLY", ('BTC', 'ETH')),
+    ("Bitcoin and ETH rally as DOT lags", ('BTC', 'DOT', 'ETH')),
+    ("Connect the dot, a ton of link", ()),
+    ("Ripple effect on markets", ()),
+    ("Tether the drone, into the ether", ()),
+    ("XRP and USDT volumes climb", ('USDT', 'XRP')),
+    ("Bitcoin Cash forks again", ('BCH',)),
+])
+def test_shipped_index_tags(text, expected):
+    assert load_entity_index().tag(text) == expected
+
+def test_shipped_aliases_are_not_common_words():
+    common = {'ripple', 'ether', 'tether', 'link', 'dot', 'ton', 'uni', 'sol', 'ada'}
+    assets = parse_assets_text(ASSETS_PATH.read_text(encoding='utf-8'))
+    assert common.isdisjoint(alias for aliases in assets.values() for alias in aliases)
+
+def test_tag_combines_texts_and_memoizes():
+    index = EntityIndex({'BTC': ['bitcoin'], 'SOL': ['solana']})
+    assert index.tag("Bitcoin up", None, "solana down") == ('BTC', 'SOL')
+    assert index.tag("Bitcoin up", None, "solana down") is index.tag("Bitcoin up", None, "solana down")
+    assert index.tag(None, "") == ()
+
+def test_asset_summary_skips_nan_and_orders_by_mentions():
+    tags = [('BTC',), ('BTC', 'ETH'), (), ('ETH',), ('BTC',)]
+    sentiments = [0.5, -0.1, 0.9, float('nan'), 0.2]
+    summary = asset_summary(tags, sentiments)
+    assert list(summary) == ['BTC', 'ETH']
+    assert summary['BTC']['mentions'] == 3
+    assert summary['BTC']['sentiment'] == pytest.approx(0.2)
+    assert summary['ETH'] == {'mentions': 1, 'sentiment': pytest.approx(-0.1)}
+
+def result_with_assets(assets):
+    return SentimentResult(value=0.0, classification="Neutral", interpretation="", raw_data={'assets': assets})
+
+def test_combine_asset_sentiment_weights_sources_by_mentions():
+    price = PriceData(current_price=3000.0, price_1h=2990.0, price_24h=2900.0,
+                      change_1h=0.003, change_24h=0.03, timestamp=None)
+    combined = combine_asset_sentiment(
+        {
+            'reddit': result_with_assets({'BTC': {'mentions': 3, 'sentiment': 0.4},
+                                          'ETH': {'mentions': 1, 'sentiment': -0.2}}),
+            'CoinTelegraph': result_with_assets({'ETH': {'mentions': 4, 'sentiment': 0.3}}),
+            'fear_greed': SentimentResult(value=0.2, classification="Greed", interpretation=""),
+        },
+        {'ETH': price}
+    )
+    assert list(combined) == ['ETH', 'BTC']
+    eth = combined['ETH']
+    assert eth.mentions == 5
+    assert math.isclose(eth.value, (-0.2 + 4 * 0.3) / 5)
+    assert eth.source_values == {'reddit': -0.2, 'CoinTelegraph': 0.3}
+    assert eth.price_data is price
+    assert combined['BTC'].price_data is None
+    assert combined['BTC'].value == pytest.approx(0.4)
+
+def test_combine_asset_sentiment_without_tallies():
+    assert combine_asset_sentiment({'reddit': result_with_assets({})}) == {}
+    assert combine_asset_sentiment({}) == {}
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from src.utils.http import hedging
+from src.utils.http.hedging import hedged_get
+
+class FakeGet:
+    """Stand-in for requests.get that replays one behaviour per call"""
+
+    def __init__(self, *behaviours):
+        self.behaviours = list(behaviours)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, timeout=None, **kwargs):
+        with self._lock:
+            behaviour = self.behaviours[self.calls]
+            self.calls += 1
+        return behaviour()
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    def install(*behaviours):
+        fake = FakeGet(*behaviours)
+        monkeypatch.setattr(hedging.requests, 'get', fake)
+        return fake
+    return install
+
+def test_without_hedge_sends_one_request(fake_get):
+    fake = fake_get(lambda: 'first')
+    assert hedged_get('http://example.test', hedge_after=None) == 'first'
+    assert fake.calls == 1
+
+def test_fast_response_is_not_hedged(fake_get):
+    fake = fake_get(lambda: 'first', lambda: 'second')
+    assert hedged_get('http://example.test', hedge_after=1) == 'first'
+    assert fake.calls == 1
+
+def test_slow_request_is_hedged(fake_get):
+    release = threading.Event()
+    def slow():
+        release.wait(timeout=5)
+        return 'slow'
+    def fast():
+        release.set()
+        return 'hedge'
+    fake = fake_get(slow, fast)
+    assert hedged_get('http://example.test', hedge_after=0.01) == 'hedge'
+    assert fake.calls == 2
+
+def test_fast_failure_is_replaced_without_waiting(fake_get):
+    def fail():
+        raise requests.ConnectionError("reset")
+    fake = fake_get(fail, lambda: 'retry')
+    start = time.monotonic()
+    assert hedged_get('http://example.test', hedge_after=10) == 'retry'
+    assert time.monotonic() - start < 5
+    assert fake.calls == 2
+
+def test_raises_last_error_when_every_copy_fails(fake_get):
+    def fail():
+        raise requests.ConnectionError("reset")
+    fake = fake_get(fail, fail)
+    with pytest.raises(requests.ConnectionError):
+        hedged_get('http://example.test', hedge_after=0.01)
+    assert fake.calls == 2
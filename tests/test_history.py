@@ -0,0 +1,61 @@
+import json
+
+from src.services.history import SentimentHistory
+
+def record(index):
+    return {'timestamp': f'2024-01-01T00:{index:02d}:00+08:00', 'final_score': index / 10}
+
+def test_append_then_read_tail(tmp_path):
+    history = SentimentHistory(str(tmp_path / 'history.jsonl'))
+    for index in range(5):
+        history.append(record(index))
+    records, offset = history.read_tail(3)
+    assert records == [record(2), record(3), record(4)]
+    assert offset == history.path.stat().st_size
+
+def test_missing_file_reads_empty(tmp_path):
+    history = SentimentHistory(str(tmp_path / 'history.jsonl'))
+    assert history.read_tail(10) == ([], 0)
+    assert history.read_from(7) == ([], 7)
+
+def test_torn_last_line_is_left_for_next_read(tmp_path):
+    history = SentimentHistory(str(tmp_path / 'history.jsonl'))
+    history.append(record(0))
+    line = json.dumps(record(1), separators=(',', ':'))
+    with open(history.path, 'a') as f:
+        f.write(line[:10])
+
+    records, offset = history.read_tail(10)
+    assert records == [record(0)]
+    assert history.read_from(offset) == ([], offset)
+
+    with open(history.path, 'a') as f:
+        f.write(line[10:] + '\n')
+    records, new_offset = history.read_from(offset)
+    assert records == [record(1)]
+    assert new_offset == history.path.stat().st_size
+
+def test_malformed_lines_are_skipped_and_offset_advances(tmp_path):
+    history = SentimentHistory(str(tmp_path / 'history.jsonl'))
+    history.append(record(0))
+    with open(history.path, 'a') as f:
+        f.write('{not json\n[1, 2]\n\n')
+    history.append(record(1))
+
+    records, offset = history.read_tail(10)
+    assert records == [record(0), record(1)]
+
+    with open(history.path, 'a') as f:
+        f.write('garbage\n')
+    history.append(record(2))
+    records, new_offset = history.read_from(offset)
+    assert records == [record(2)]
+    assert new_offset == history.path.stat().st_size
+
+def test_truncated_file_is_read_from_start(tmp_path):
+    history = SentimentHistory(str(tmp_path / 'history.jsonl'))
+    for index in range(3):
+        history.append(record(index))
+    _, offset = history.read_tail(10)
+    history.path.write_text(json.dumps(record(9)) + '\n')
+    assert history.read_from(offset)[0] == [record(9)]
@@ -0,0 +1,56 @@
+import pytest
+
+from src.sentiment import lexicon as lexicon_module
+from src.sentiment.lexicon import (
+    FORMAT_VERSION,
+    HEADER,
+    artifact_is_current,
+    parse_lexicon_text,
+    read_artifact_header,
+    read_lexicon_artifact,
+    write_lexicon_artifact,
+)
+from src.utils.errors.exceptions import ConfigurationError
+
+VADER_TEXT = "good\t1.9\t0.9\t[2, 2]\nbad\t-2.5\t0.5\t[-3, -2]\n#-)\t1.0\t0.0\t[1]\n"
+OVERRIDES_TEXT = "# crypto overrides\nbad\t-1.0\nrekt\t-2.8\n"
+
+@pytest.fixture
+def artifact(tmp_path):
+    return write_lexicon_artifact(tmp_path / 'vader_crypto.lex', VADER_TEXT, OVERRIDES_TEXT)
+
+def test_parse_lexicon_text_comments():
+    assert parse_lexicon_text(VADER_TEXT) == {'good': 1.9, 'bad': -2.5, '#-)': 1.0}
+    assert parse_lexicon_text(OVERRIDES_TEXT, comments=True) == {'bad': -1.0, 'rekt': -2.8}
+
+def test_round_trip(artifact):
+    assert read_lexicon_artifact(artifact) == {'good': 1.9, 'bad': -1.0, '#-)': 1.0, 'rekt': -2.8}
+    assert read_lexicon_artifact(artifact, overrides_text=OVERRIDES_TEXT)['rekt'] == -2.8
+
+def test_header(artifact):
+    version, count, vader_digest, overrides_digest = read_artifact_header(artifact)
+    assert (version, count) == (FORMAT_VERSION, 4)
+    assert vader_digest != overrides_digest
+    # Values are viewed in place, so they must start 8-byte aligned
+    assert HEADER.size % 8 == 0
+
+def test_mismatched_overrides_raise(artifact):
+    with pytest.raises(ConfigurationError, match='stale'):
+        read_lexicon_artifact(artifact, overrides_text=OVERRIDES_TEXT + "wagmi\t2.0\n")
+
+def test_other_version_raises(artifact):
+    data = bytearray(artifact.read_bytes())
+    data[4] = FORMAT_VERSION + 1
+    artifact.write_bytes(bytes(data))
+    with pytest.raises(ConfigurationError, match='Unsupported'):
+        read_lexicon_artifact(artifact)
+
+def test_artifact_is_current(artifact, tmp_path, monkeypatch):
+    overrides = tmp_path / 'crypto_lexicon_overrides.tsv'
+    overrides.write_text(OVERRIDES_TEXT, encoding='utf-8')
+    monkeypatch.setattr(lexicon_module, 'OVERRIDES_PATH', overrides)
+    assert artifact_is_current(artifact)
+
+    overrides.write_text(OVERRIDES_TEXT + "wagmi\t2.0\n", encoding='utf-8')
+    assert not artifact_is_current(artifact)
+    assert not artifact_is_current(tmp_path / 'missing.lex')
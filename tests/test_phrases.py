@@ -0,0 +1,91 @@
+import itertools
+import random
+
+import pytest
+
+from src.sentiment.entities import EntityIndex
+from src.sentiment.lexicon import DomainSentimentAnalyzer
+from src.sentiment.phrases import PhraseMatcher, phrase_tokens
+
+def brute_force_find(phrases, tokens):
+    """Leftmost-longest matches by trying every phrase at every position"""
+    compiled = {phrase_tokens(phrase): value for phrase, value in phrases.items()}
+    matches = []
+    i = 0
+    while i < len(tokens):
+        for length in range(len(tokens) - i, 0, -1):
+            candidate = tuple(tokens[i:i + length])
+            if candidate in compiled:
+                matches.append((i, i + length, compiled[candidate]))
+                i += length
+                break
+        else:
+            i += 1
+    return matches
+
+def test_finds_phrase_on_word_boundaries():
+    matcher = PhraseMatcher({'bull run': 1})
+    assert matcher.find('the bull run continues'.split()) == [(1, 3, 1)]
+    assert matcher.find('the bull runs'.split()) == []
+
+def test_prefers_longest_phrase_at_same_start():
+    matcher = PhraseMatcher({'to the moon': 1, 'to the moon soon': 2})
+    assert matcher.find('to the moon soon'.split()) == [(0, 4, 2)]
+    assert matcher.find('to the moon later'.split()) == [(0, 3, 1)]
+
+def test_suffix_phrase_inside_longer_phrase():
+    matcher = PhraseMatcher({'all time high': 1, 'new all time high': 2})
+    assert matcher.find('a new all time high today'.split()) == [(1, 5, 2)]
+    assert matcher.find('near the all time high'.split()) == [(2, 5, 1)]
+
+def test_suffix_phrase_found_after_failed_longer_phrase():
+    # 'new all time' fails on 'low' and must fall back to the 'all time' branch
+    matcher = PhraseMatcher({'new all time high': 2, 'all time low': -1})
+    assert matcher.find('new all time low'.split()) == [(1, 4, -1)]
+
+def test_overlapping_phrases_keep_leftmost():
+    matcher = PhraseMatcher({'pump and dump': 1, 'dump it': 2})
+    assert matcher.find('pump and dump it'.split()) == [(0, 3, 1)]
+    assert matcher.find('they dump it'.split()) == [(1, 3, 2)]
+
+def test_repeated_and_adjacent_matches():
+    matcher = PhraseMatcher({'bull run': 1, 'bear market': 2})
+    tokens = 'bull run bear market bull run'.split()
+    assert matcher.find(tokens) == [(0, 2, 1), (2, 4, 2), (4, 6, 1)]
+
+def test_phrases_tokenized_like_vader():
+    matcher = PhraseMatcher({'Buy The Dip': 1, 'a': 2})
+    assert len(matcher) == 1
+    assert matcher.find(['buy', 'the', 'dip']) == [(0, 3, 1)]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    vocabulary = ['aa', 'bb', 'cc', 'dd']
+    phrases = {
+        ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4))): index
+        for index in range(8)
+    }
+    matcher = PhraseMatcher(phrases)
+    for length in range(7):
+        for tokens in itertools.islice(itertools.product(vocabulary, repeat=length), 200):
+            assert matcher.find(list(tokens)) == brute_force_find(phrases, list(tokens))
+
+def test_entity_index_prefers_bitcoin_cash_over_bitcoin():
+    index = EntityIndex({'BTC': ['bitcoin'], 'BCH': ['bitcoin cash']})
+    assert index.tag('Bitcoin Cash rallies') == ('BCH',)
+    assert index.tag('Bitcoin beats bitcoin cash') == ('BCH', 'BTC')
+    assert index.tag('bitcoin falls', '$BCH flat') == ('BCH', 'BTC')
+
+def test_negated_phrase_flips_sign():
+    analyzer = DomainSentimentAnalyzer(lexicon={}, phrases=PhraseMatcher({'to the moon': 3.0}))
+    assert analyzer.polarity_scores('going to the moon')['compound'] > 0
+    assert analyzer.polarity_scores('not to the moon')['compound'] < 0
+    assert analyzer.polarity_scores("isn't going to the moon")['compound'] < 0
+    assert analyzer.polarity_scores('not that it goes to the moon')['compound'] > 0
+
+def test_phrase_replaces_word_valences():
+    analyzer = DomainSentimentAnalyzer(lexicon={'dump': -2.0},
+                                       phrases=PhraseMatcher({'pump and dump': -2.6}))
+    plain = DomainSentimentAnalyzer(lexicon={'dump': -2.0}, phrases=PhraseMatcher({}))
+    assert analyzer.polarity_scores('pump and dump')['compound'] < plain.polarity_scores('pump and dump')['compound']
@@ -0,0 +1,110 @@
+import json
+import math
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer
+from urllib.request import urlopen
+
+import pytest
+
+from src.services.query_server import SentimentRingBuffer, _parse_time, make_handler
+
+def record(minute, score, price=100.0):
+    return {
+        'timestamp': f'2024-01-01T00:{minute:02d}:00+08:00',
+        'final_score': score,
+        'fear_greed_score': 0.1,
+        'reddit_score': 0.2,
+        'rss_1_score': 0.3,
+        'rss_2_score': None,
+        'price': {'current_price': price} if price is not None else None,
+    }
+
+def at(minute):
+    return datetime.fromisoformat(f'2024-01-01T00:{minute:02d}:00+08:00').timestamp()
+
+@pytest.fixture
+def buffer():
+    buffer = SentimentRingBuffer(capacity=8)
+    buffer.extend(record(minute, minute / 10) for minute in range(5))
+    return buffer
+
+def test_latest_is_last_record(buffer):
+    assert json.loads(buffer.latest()) == record(4, 0.4)
+    assert SentimentRingBuffer().latest() == b'null'
+
+def test_range_includes_start_and_excludes_end(buffer):
+    records = json.loads(buffer.range(at(1), at(3)))
+    assert [r['final_score'] for r in records] == [0.1, 0.2]
+    assert len(json.loads(buffer.range())) == 5
+    assert json.loads(buffer.range(at(10))) == []
+
+def test_aggregate_within_bounds(buffer):
+    summary = json.loads(buffer.aggregate('final_score', at(1), at(4)))
+    assert summary['count'] == 3
+    assert summary['first'] == 0.1 and summary['last'] == 0.3
+    assert math.isclose(summary['mean'], 0.2)
+    assert json.loads(buffer.aggregate('final_score', at(10))) == {'field': 'final_score', 'count': 0}
+
+def test_aggregate_skips_missing_values(buffer):
+    buffer.extend([record(5, 0.5, price=None)])
+    assert json.loads(buffer.aggregate('price'))['count'] == 5
+    assert json.loads(buffer.aggregate('rss_2_score'))['count'] == 0
+
+def test_aggregate_rejects_unknown_field(buffer):
+    with pytest.raises(ValueError):
+        buffer.aggregate('volume')
+
+def test_capacity_evicts_oldest(buffer):
+    buffer.extend(record(minute, minute / 10) for minute in range(5, 12))
+    assert len(buffer) == 8
+    assert json.loads(buffer.range())[0]['timestamp'] == record(4, 0)['timestamp']
+
+@pytest.mark.parametrize('bad', [
+    {'final_score': 'bad'},
+    {'final_score': {'nested': 1}},
+    {'timestamp': 'yesterday'},
+    {'price': {'volume': 1}},
+])
+def test_bad_record_is_skipped_without_breaking_buffer(buffer, bad):
+    buffer.extend([{**record(5, 0.5), **bad}, record(6, 0.6)])
+    assert json.loads(buffer.latest())['final_score'] == 0.6
+    buffer.extend([record(7, 0.7)])
+    assert len(buffer) == 7
+    assert json.loads(buffer.aggregate('final_score'))['last'] == 0.7
+
+def test_missing_field_is_skipped(buffer):
+    incomplete = record(5, 0.5)
+    del incomplete['reddit_score']
+    buffer.extend([incomplete])
+    assert len(buffer) == 5
+
+@pytest.mark.parametrize('value', [
+    '2024-01-01T00:02:00+08:00',
+    '2024-01-01T00:02:00 08:00',
+    '2024-01-01T00:02:00 0800',
+    '2023-12-31T16:02:00Z',
+    str(at(2)),
+])
+def test_parse_time_accepts_record_timestamps(value):
+    assert _parse_time(value) == at(2)
+
+def test_parse_time_rejects_garbage():
+    assert _parse_time(None) is None
+    with pytest.raises(ValueError):
+        _parse_time('soon')
+
+def test_http_range_with_unencoded_offset(buffer):
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(buffer))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base = f'http://127.0.0.1:{httpd.server_address[1]}'
+        with urlopen(f'{base}/range?start=2024-01-01T00:03:00+08:00') as response:
+            records = json.loads(response.read())
+        assert [r['final_score'] for r in records] == [0.3, 0.4]
+        with urlopen(f'{base}/aggregate?field=final_score&end=2024-01-01T00:02:00%2B08:00') as response:
+            assert json.loads(response.read())['count'] == 2
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
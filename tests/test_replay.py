@@ -0,0 +1,127 @@
+from datetime import datetime
+
+import pytest
+from pytz import timezone
+
+from src.config import config
+from src.sentiment import fear_greed_index, rss_feed
+from src.sentiment.combiner import build_fear_greed_score, build_reddit_score, combine_asset_sentiment, combine_sentiment
+from src.sentiment.fear_greed_index import CNNFearGreedFetcher, FearGreedAnalyzer
+from src.sentiment.reddit_analyzer import RedditSentimentAnalyzer
+from src.sentiment.rss_feed import RSSFeedSentimentAnalyzer
+from src.services import price_service as price_module
+from src.services.price_service import CryptoPriceService
+from src.services.replay import ReplayEngine
+from src.services.snapshot_archive import SnapshotArchive, build_snapshot
+
+FEEDS = ['CoinTelegraph', 'CryptoSlate']
+RUN_TIME = timezone('Asia/Singapore').localize(datetime(2024, 3, 1, 8, 0))
+
+FEAR_GREED = {'data': [{'value': '62', 'value_classification': 'Greed', 'timestamp': '1709251200'}]}
+PRICES = {'data': {
+    '1': {'symbol': 'BTC', 'quotes': {'USD': {'price': 61000.0, 'percentage_change_1h': 0.4, 'percentage_change_24h': -1.5}}},
+    '1027': {'symbol': 'ETH', 'quotes': {'USD': {'price': 3400.0, 'percentage_change_1h': 0.1, 'percentage_change_24h': 2.0}}},
+}}
+TITLES = ['Bitcoin rally is great', 'Ethereum crash is terrible', 'Solana looks good', 'Bad day for BTC',
+          'ETH gains are happy news', 'Market fear today']
+POSTS = [
+    {'name': f't3_{i}', 'title': TITLES[i % len(TITLES)], 'text': 'great gains' if i % 3 == 0 else '',
+     'score': i, 'num_comments': i % 5}
+    for i in range(60)
+]
+FEED_ITEMS = {
+    name: [
+        {'id': f'{name}-{i}', 'url': f'https://example.test/{i}', 'title': TITLES[(i + offset) % len(TITLES)],
+         'content_text': 'Bitcoin and Ethereum traders are happy', 'content_html': '<p>ignored</p>',
+         'date_published': '2024-03-01T00:00:00Z', 'authors': [], 'attachments': []}
+        for i in range(12)
+    ]
+    for offset, name in enumerate(FEEDS)
+}
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+@pytest.fixture
+def fake_http(monkeypatch):
+    payloads = {
+        config.api_config.fng_api_url: FEAR_GREED,
+        config.api_config.bitcoin_price_api_url: PRICES,
+        **{config.api_config.rss_feeds[name]: {'items': FEED_ITEMS[name]} for name in FEEDS},
+    }
+    def fake_get(url, **kwargs):
+        return FakeResponse(payloads[url])
+    for module in (fear_greed_index, rss_feed, price_module):
+        monkeypatch.setattr(module, 'hedged_get', fake_get)
+
+def fake_fetch_posts(limit=100, subreddit=None, sort=None, after=None):
+    start = 0 if after is None else int(after[3:]) + 1
+    return [dict(post) for post in POSTS[start:start + limit]]
+
+def live_run():
+    """The collection steps of src/exec/sentiment.py against fake sources"""
+    fear_greed_fetcher = CNNFearGreedFetcher(config.api_config.fng_api_url)
+    reddit_analyzer = RedditSentimentAnalyzer()
+    reddit_analyzer.fetch_posts = fake_fetch_posts
+    rss_analyzers = {name: RSSFeedSentimentAnalyzer(config.api_config.rss_feeds[name]) for name in FEEDS}
+    price_service = CryptoPriceService()
+
+    fear_greed_result = FearGreedAnalyzer(fear_greed_fetcher).get_sentiment()
+    reddit_result = reddit_analyzer.get_sentiment()
+    rss_results = {name: analyzer.get_sentiment() for name, analyzer in rss_analyzers.items()}
+    price_data = price_service.get_bitcoin_price()
+    combined = combine_sentiment(
+        fear_greed_score=build_fear_greed_score(fear_greed_result),
+        reddit_score=build_reddit_score(reddit_result),
+        rss_1_score=rss_results['CoinTelegraph'],
+        rss_2_score=rss_results['CryptoSlate'],
+        price_data=price_data,
+        weights=config.sentiment,
+        timestamp=RUN_TIME,
+        assets=combine_asset_sentiment(
+            {'reddit': reddit_result, **rss_results},
+            price_service.parse_asset_prices(price_service.last_payload)
+        )
+    )
+    snapshot = build_snapshot(
+        timestamp=RUN_TIME,
+        fear_greed_payload=fear_greed_fetcher.last_payload,
+        reddit_posts=reddit_analyzer.last_posts,
+        rss_items={name: analyzer.scraper.last_raw_items for name, analyzer in rss_analyzers.items()},
+        price_payload=price_service.last_payload
+    )
+    return combined, snapshot
+
+def test_replay_from_archive_matches_live_run(fake_http, tmp_path):
+    combined, snapshot = live_run()
+    archive = SnapshotArchive(str(tmp_path))
+    archive.append(snapshot)
+
+    [replayed] = ReplayEngine(feed_names=FEEDS).replay(archive.iter_snapshots())
+    assert combined.assets and combined.price_data
+    assert replayed.combined.to_dict() == combined.to_dict()
+
+def test_unparseable_price_replays_without_price(fake_http):
+    _, snapshot = live_run()
+    snapshot['price'] = {'data': {'1027': PRICES['data']['1027']}}
+
+    engine = ReplayEngine(feed_names=FEEDS)
+    [replayed] = engine.replay([snapshot])
+    assert engine.skipped == 0
+    assert replayed.combined.price_data is None
+    assert 'ETH' in replayed.combined.assets
+
+def test_snapshot_without_fear_greed_is_skipped(fake_http):
+    _, snapshot = live_run()
+    snapshot['fear_greed'] = None
+
+    engine = ReplayEngine(feed_names=FEEDS)
+    assert list(engine.replay([snapshot])) == []
+    assert engine.skipped == 1
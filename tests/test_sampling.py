@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from src.config import SentimentConfig, config
+from src.sentiment.reddit_analyzer import RedditSentimentAnalyzer
+from src.sentiment.rss_feed import RSSFeedSentimentAnalyzer, RSSItem
+from src.sentiment.scoring import AdaptiveSampler
+
+class FakeScorer:
+    """Polarity scorer reading the compound score from the text itself"""
+
+    def polarity_scores(self, text):
+        compound = float(text.split()[-1]) if text else 0.0
+        return {'compound': compound, 'pos': max(compound, 0.0), 'neg': max(-compound, 0.0), 'neu': 0.0}
+
+def scores(count, spread, seed=0):
+    return np.random.default_rng(seed).uniform(-spread, spread, size=count).round(4)
+
+class FakeListing:
+    """Paged Reddit listing over posts with the given title scores"""
+
+    def __init__(self, values):
+        self.posts = [
+            {'name': f't3_{i}', 'title': f'post {value}', 'text': '', 'score': 1, 'num_comments': 0}
+            for i, value in enumerate(values)
+        ]
+        self.limits = []
+
+    def __call__(self, limit, subreddit, sort, after):
+        self.limits.append(limit)
+        start = 0 if after is None else int(after[3:]) + 1
+        return self.posts[start:start + limit]
+
+def reddit_analyzer(listing, sampler):
+    analyzer = RedditSentimentAnalyzer(sia=FakeScorer(), sampler=sampler)
+    analyzer.fetch_posts = listing
+    return analyzer
+
+def rss_items(values):
+    return [RSSItem(id=str(i), url='', title=f'item {value}', content_text=f'body {value}', content_html='',
+                    image=None, published_date=None, authors=[], attachments=[])
+            for i, value in enumerate(values)]
+
+def test_default_sampler_converges_within_one_page_at_typical_spread():
+    # Compound scores of a quiet period: sd about 0.35
+    sampler = AdaptiveSampler.from_config(SentimentConfig(), max_items=100)
+    values = np.random.default_rng(1).normal(0.1, 0.35, size=SentimentConfig().sampling_page_size)
+    assert sampler.is_done(values, len(values))
+
+def test_low_variance_reddit_stream_stops_after_one_page():
+    listing = FakeListing(scores(200, 0.05))
+    result = reddit_analyzer(listing, AdaptiveSampler(page_size=25, tolerance=0.05, max_items=100)).get_sentiment()
+    assert listing.limits == [25]
+    assert result.raw_data['sampling']['converged']
+    assert result.raw_data['sampling']['items_scored'] == 25
+
+def test_dispersed_reddit_stream_samples_up_to_cap():
+    listing = FakeListing(scores(200, 1.0))
+    result = reddit_analyzer(listing, AdaptiveSampler(page_size=25, tolerance=0.05, max_items=100)).get_sentiment()
+    assert listing.limits == [25, 25, 25, 25]
+    assert not result.raw_data['sampling']['converged']
+
+def test_short_reddit_listing_stops_at_last_page():
+    listing = FakeListing(scores(30, 1.0))
+    result = reddit_analyzer(listing, AdaptiveSampler(page_size=25, tolerance=0.0, max_items=100)).get_sentiment()
+    assert listing.limits == [25, 25]
+    assert result.raw_data['sampling']['items_scored'] == 30
+
+def test_uncapped_sampler_stops_at_configured_post_limit(monkeypatch):
+    monkeypatch.setattr(config.sentiment, 'reddit_post_limit', 60)
+    listing = FakeListing(scores(200, 1.0))
+    result = reddit_analyzer(listing, AdaptiveSampler(page_size=25, tolerance=0.0)).get_sentiment()
+    assert result.classification != "Error"
+    assert listing.limits == [25, 25, 10]
+    assert result.raw_data['sampling']['items_scored'] == 60
+
+@pytest.mark.parametrize('spread, expected', [(0.05, 20), (1.0, 80)])
+def test_rss_sampling_stops_once_converged(spread, expected):
+    analyzer = RSSFeedSentimentAnalyzer(sia=FakeScorer(), sampler=AdaptiveSampler(page_size=20, tolerance=0.05))
+    items = rss_items(scores(80, spread))
+    result = analyzer.analyze_items(items)
+    sampling = result.raw_data['sampling']
+    assert result.raw_data['items_analyzed'] == expected
+    assert sampling['items_scored'] == expected
+    assert sampling['items_available'] == 80
+    assert sampling['converged'] == (expected < 80)
+    assert sampling['ci_low'] <= result.value <= sampling['ci_high']
+
+def test_rss_sampling_respects_cap():
+    analyzer = RSSFeedSentimentAnalyzer(sia=FakeScorer(),
+                                        sampler=AdaptiveSampler(page_size=20, tolerance=0.0, max_items=50))
+    result = analyzer.analyze_items(rss_items(scores(80, 1.0)))
+    assert result.raw_data['items_analyzed'] == 50
+
+def test_rss_without_sampler_scores_every_item():
+    analyzer = RSSFeedSentimentAnalyzer(sia=FakeScorer())
+    analyzer.sampler = None
+    result = analyzer.analyze_items(rss_items(scores(80, 0.05)))
+    assert result.raw_data['items_analyzed'] == 80
+    assert 'sampling' not in result.raw_data
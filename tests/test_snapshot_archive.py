@@ -0,0 +1,77 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.services import snapshot_archive
+from src.services.snapshot_archive import SnapshotArchive, build_snapshot
+
+START = datetime(2024, 1, 31, 20, 0)
+
+def snapshot(index):
+    return build_snapshot(START + timedelta(hours=4 * index), {'data': [{'value': index}]}, [], {}, None)
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = SnapshotArchive(str(tmp_path / 'archive'))
+    for index in range(4):
+        archive.append(snapshot(index))
+    return archive
+
+def timestamps(snapshots):
+    return [s['timestamp'] for s in snapshots]
+
+def test_snapshots_read_back_in_order_across_months(archive):
+    assert timestamps(archive.iter_snapshots()) == [snapshot(i)['timestamp'] for i in range(4)]
+    assert sorted(path.name for path in archive.archive_dir.iterdir()) == ['snapshots-2024-01', 'snapshots-2024-02']
+
+def test_time_range_is_half_open(archive):
+    selected = archive.iter_snapshots(start=START + timedelta(hours=4), end=START + timedelta(hours=12))
+    assert timestamps(selected) == [snapshot(1)['timestamp'], snapshot(2)['timestamp']]
+
+def test_failed_append_leaves_no_partial_snapshot(archive, monkeypatch):
+    def crash(src, dst):
+        raise OSError("killed")
+    monkeypatch.setattr(snapshot_archive.os, 'replace', crash)
+    with pytest.raises(OSError):
+        archive.append(snapshot(4))
+    monkeypatch.undo()
+
+    # The half-written temporary file is ignored and later appends still land
+    assert list(archive.archive_dir.rglob('*.tmp'))
+    archive.append(snapshot(5))
+    assert timestamps(archive.iter_snapshots())[-2:] == [snapshot(3)['timestamp'], snapshot(5)['timestamp']]
+
+def test_append_does_not_rewrite_earlier_snapshots(archive):
+    first = archive._path_for(START)
+    before = first.stat().st_mtime_ns
+    os.utime(first, ns=(before - 10**9, before - 10**9))
+    archive.append(snapshot(4))
+    assert first.stat().st_mtime_ns == before - 10**9
+
+def test_damaged_snapshot_is_skipped(archive, capsys):
+    damaged = archive._path_for(START + timedelta(hours=4))
+    damaged.write_bytes(damaged.read_bytes()[:20])
+    archive._path_for(START + timedelta(hours=8)).write_bytes(gzip.compress(b'{not json'))
+
+    assert timestamps(archive.iter_snapshots()) == [snapshot(0)['timestamp'], snapshot(3)['timestamp']]
+    assert capsys.readouterr().out.count('Skipping damaged snapshot') == 2
+
+def test_legacy_monthly_file_read_before_month_directory(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    legacy = [snapshot(0), snapshot(1)]
+    with open(tmp_path / 'snapshots-2024-02.jsonl.gz', 'wb') as f:
+        for item in legacy:
+            f.write(gzip.compress((json.dumps(item) + '\n').encode('utf-8')))
+    archive.append(snapshot(2))
+    assert timestamps(archive.iter_snapshots()) == timestamps([*legacy, snapshot(2)])
+
+def test_truncated_legacy_file_keeps_earlier_snapshots(tmp_path, capsys):
+    archive = SnapshotArchive(str(tmp_path))
+    path = tmp_path / 'snapshots-2024-02.jsonl.gz'
+    member = gzip.compress((json.dumps(snapshot(1)) + '\n').encode('utf-8'))
+    path.write_bytes(member + member[:len(member) // 2])
+    assert timestamps(archive.iter_snapshots()) == [snapshot(1)['timestamp']]
+    assert 'damaged archive' in capsys.readouterr().out
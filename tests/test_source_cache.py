@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src.config import SourceCacheConfig
+from src.sentiment.base_analyzer import SentimentResult
+from src.services.source_cache import SourceCache, is_stale
+
+def make_result(value, classification="Greed"):
+    return SentimentResult(value=value, classification=classification, interpretation="live",
+                           raw_data={'value': value})
+
+def error_result():
+    return SentimentResult(value=0.0, classification="Error", interpretation="Error: boom")
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SourceCache(cache_file=str(tmp_path / 'source_cache.json'), settings=SourceCacheConfig())
+    yield cache
+    cache._executor.shutdown(wait=True)
+
+def slow_fetch(release, result):
+    """Fetch that blocks until ``release`` is set"""
+    def fetch():
+        release.wait(timeout=5)
+        return result
+    return fetch
+
+def test_fresh_result_is_stored(cache):
+    result = cache.get_sentiment('fear_greed', lambda: make_result(0.4), latency_budget=1)
+    assert result == make_result(0.4)
+    stored = json.loads(cache.cache_file.read_text())
+    assert stored['fear_greed']['result']['value'] == 0.4
+
+def test_budget_timeout_serves_cached_value(cache):
+    cache.store('reddit', make_result(0.2))
+    release = threading.Event()
+    try:
+        result = cache.get_sentiment('reddit', slow_fetch(release, make_result(0.9)), latency_budget=0.05)
+    finally:
+        release.set()
+    assert is_stale(result)
+    assert result.value == 0.2
+    assert result.raw_data['stale_reason'] == "no response within 0.05s"
+
+def test_budget_timeout_without_cached_value_waits_for_fetch(cache):
+    release = threading.Event()
+    threading.Timer(0.1, release.set).start()
+    result = cache.get_sentiment('reddit', slow_fetch(release, make_result(0.9)), latency_budget=0.01)
+    assert not is_stale(result)
+    assert result.value == 0.9
+
+def test_budget_timeout_without_cached_value_raises_fetch_error(cache):
+    def fetch():
+        time.sleep(0.05)
+        raise ConnectionError("down")
+    with pytest.raises(ConnectionError):
+        cache.get_sentiment('reddit', fetch, latency_budget=0.01)
+
+def test_expired_cached_value_is_not_served(tmp_path):
+    settings = SourceCacheConfig(default_max_age=60)
+    cache = SourceCache(cache_file=str(tmp_path / 'source_cache.json'), settings=settings)
+    cache.store('rss', make_result(0.3))
+    cache._entries['rss']['cached_at'] -= 120
+    assert cache.get_sentiment('rss', error_result, latency_budget=1).classification == "Error"
+    cache._executor.shutdown(wait=True)
+
+def test_error_result_serves_cached_value(cache):
+    cache.store('rss', make_result(0.3))
+    result = cache.get_sentiment('rss', error_result, latency_budget=1)
+    assert is_stale(result)
+    assert result.raw_data['stale_reason'] == "Error: boom"
+
+def test_background_revalidation_writes_cache(cache):
+    cache.store('reddit', make_result(0.2))
+    release = threading.Event()
+    result = cache.get_sentiment('reddit', slow_fetch(release, make_result(0.9)), latency_budget=0.01)
+    assert is_stale(result)
+
+    release.set()
+    cache._executor.shutdown(wait=True)
+    stored = json.loads(cache.cache_file.read_text())
+    assert stored['reddit']['result']['value'] == 0.9
+    reloaded = SourceCache(cache_file=str(cache.cache_file), settings=SourceCacheConfig())
+    assert reloaded.get_stale('reddit', "test").value == 0.9
+    reloaded._executor.shutdown(wait=True)
+
+def test_failed_revalidation_keeps_cached_value(cache):
+    cache.store('reddit', make_result(0.2))
+    calls = []
+    def fetch():
+        calls.append(1)
+        raise ConnectionError("down")
+    result = cache.get_sentiment('reddit', fetch, latency_budget=1)
+    assert is_stale(result)
+
+    cache._executor.shutdown(wait=True)
+    assert len(calls) == 2
+    stored = json.loads(cache.cache_file.read_text())
+    assert stored['reddit']['result']['value'] == 0.2